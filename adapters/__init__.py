@@ -0,0 +1,8 @@
+"""
+Autoscribe adapters.
+
+The modules import their siblings relative to this package when imported
+as ``adapters.<name>``, and by bare name when ``adapters/`` itself is on
+``sys.path`` (including when ``snippets.py`` or ``makenewfile.py`` is run
+as a script).
+"""
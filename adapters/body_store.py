@@ -0,0 +1,141 @@
+"""
+Content-addressed store for snippet bodies.
+
+Bodies are kept once per sha256 (the file hash emit_instructions already
+computes) in a SQLite blob table, optionally zstd-compressed. Records then
+carry a ``content_ref`` of the form ``sha256:<hex>`` instead of the text.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Record field carrying the ref. It belongs with the FIELD_* constants in
+# autoscribe_shapes.ndjson, which is maintained outside this repo; until
+# the shapes package defines it, the adapters take it from here.
+FIELD_CONTENT_REF = "content_ref"
+REF_PREFIX = "sha256:"
+
+CODEC_NONE = "none"
+CODEC_ZSTD = "zstd"
+CODECS = (CODEC_NONE, CODEC_ZSTD)
+
+
+def make_ref(sha: str) -> str:
+    return f"{REF_PREFIX}{sha}"
+
+
+def parse_ref(ref: str) -> str:
+    if not isinstance(ref, str) or not ref.startswith(REF_PREFIX):
+        raise RuntimeError(f"Invalid content_ref {ref!r}")
+    sha = ref[len(REF_PREFIX):]
+    if len(sha) != 64:
+        raise RuntimeError(f"Invalid content_ref {ref!r}")
+    return sha
+
+
+def decode_body(codec: str, blob: bytes, *, sha: str) -> str:
+    """
+    Decode a stored body blob written with ``codec``.
+    """
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("Stored body is zstd; install zstandard")
+        blob = zstandard.ZstdDecompressor().decompress(blob)
+    elif codec != CODEC_NONE:
+        raise RuntimeError(f"Unknown codec {codec!r} for body {sha}")
+    return bytes(blob).decode("utf-8")
+
+
+class BodyStore:
+    """
+    Snippet bodies keyed by sha256, on a caller-owned connection.
+
+    The caller commits; ``put`` only writes bodies that are not yet stored.
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        *,
+        codec: str = CODEC_NONE,
+        level: int = 3,
+    ) -> None:
+        if codec not in CODECS:
+            raise RuntimeError(f"Unknown body codec {codec!r}; expected {CODECS}")
+        if codec == CODEC_ZSTD and zstandard is None:
+            raise RuntimeError("zstd body compression needs the zstandard package")
+
+        self._conn = conn
+        self._codec = codec
+        self._compressor = (
+            zstandard.ZstdCompressor(level=level) if codec == CODEC_ZSTD else None
+        )
+        self._known: set[str] = set()
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS snippet_bodies (
+                sha256 TEXT PRIMARY KEY,
+                codec TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                body BLOB NOT NULL
+            )
+            """
+        )
+
+    def has(self, sha: str) -> bool:
+        if sha in self._known:
+            return True
+        row = self._conn.execute(
+            "SELECT 1 FROM snippet_bodies WHERE sha256 = ?",
+            (sha,),
+        ).fetchone()
+        if row is not None:
+            self._known.add(sha)
+        return row is not None
+
+    def put(self, sha: str, text: str) -> str:
+        """
+        Store ``text`` under ``sha`` if it is new; return its content_ref.
+        """
+        if not self.has(sha):
+            raw = text.encode("utf-8")
+            blob = self._compressor.compress(raw) if self._compressor else raw
+            self._conn.execute(
+                """
+                INSERT OR IGNORE INTO snippet_bodies (sha256, codec, size, body)
+                VALUES (?, ?, ?, ?)
+                """,
+                (sha, self._codec, len(raw), blob),
+            )
+            self._known.add(sha)
+        return make_ref(sha)
+
+    def get(self, ref_or_sha: str) -> str:
+        sha = (
+            parse_ref(ref_or_sha)
+            if ref_or_sha.startswith(REF_PREFIX)
+            else ref_or_sha
+        )
+        row = self._conn.execute(
+            "SELECT codec, body FROM snippet_bodies WHERE sha256 = ?",
+            (sha,),
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"No stored body for {sha}")
+        return decode_body(row[0], row[1], sha=sha)
+
+
+__all__ = [
+    "BodyStore",
+    "FIELD_CONTENT_REF",
+    "REF_PREFIX",
+    "decode_body",
+    "make_ref",
+    "parse_ref",
+]
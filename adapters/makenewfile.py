@@ -2,11 +2,19 @@
 from __future__ import annotations
 
 import json
+import os
 import re
+import fnmatch
+import hashlib
+import itertools
 import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterator, TextIO
+from typing import Iterable, Iterator, TextIO
 from urllib.parse import urlparse
 
 import attr
@@ -14,6 +22,14 @@ import fire
 
 from asc.core.contracts import ensure_contracts_shapes
 
+# Run as a script, the siblings are importable by bare name.
+if __package__:
+    from . import ndjson_codec, note_bundle, stage_profile
+else:
+    import ndjson_codec
+    import note_bundle
+    import stage_profile
+
 ensure_contracts_shapes()
 from autoscribe_shapes.regex import ALNUM_TOKEN_RE
 from autoscribe_shapes.ndjson import (
@@ -31,6 +47,12 @@ from autoscribe_shapes.ndjson import (
 _ALNUM_RE = ALNUM_TOKEN_RE
 _CANDIDATE_FIELDS = list(SOURCE_LABEL_CANDIDATE_FIELDS)
 
+SHARD_BY_HASH = "hash"
+SHARD_BY_DATE = "date"
+SHARD_MODES = (SHARD_BY_HASH, SHARD_BY_DATE)
+# Deepest layout per mode: hash levels (one digest byte each), YYYY/MM/DD.
+_SHARD_DEPTH_LIMITS = {SHARD_BY_HASH: 4, SHARD_BY_DATE: 3}
+
 
 def _strip_extensions(name: str) -> str:
     if not name:
@@ -95,37 +117,541 @@ class EmitItem:
     line_no: int
 
 
+class _OutputIndex:
+    """
+    Names present in an output directory, listed once with os.scandir.
+
+    Answers the exists check from memory and is kept current as files are
+    written, so a run costs one directory listing instead of a stat and a
+    mkdir per record. Names being written are held in a reservation table
+    so concurrent writers never race for the same file.
+
+    A ``recursive`` index holds the file names of every non-hidden
+    subdirectory, so a name is taken once whichever shard it lives in.
+    """
+
+    def __init__(self, root: Path, *, recursive: bool = False) -> None:
+        self.root = root
+        self.recursive = recursive
+        self._lock = threading.Lock()
+        self._names: set[str] | None = None
+        self._reserved: set[str] = set()
+        self._made: set[Path] = set()
+
+    def _loaded(self) -> set[str]:
+        if self._names is None:
+            names: set[str] = set()
+            stack = [self.root]
+            while stack:
+                directory = stack.pop()
+                try:
+                    with os.scandir(directory) as entries:
+                        for entry in entries:
+                            if not self.recursive:
+                                names.add(entry.name)
+                            elif entry.is_dir(follow_symlinks=False):
+                                if not entry.name.startswith("."):
+                                    stack.append(Path(entry.path))
+                            else:
+                                names.add(entry.name)
+                except FileNotFoundError:
+                    continue
+                self._made.add(directory)
+            self._names = names
+        return self._names
+
+    def exists(self, name: str) -> bool:
+        with self._lock:
+            return name in self._loaded() or name in self._reserved
+
+    def reserve(self, name: str) -> bool:
+        """
+        Claim ``name`` for writing; False if it exists or is claimed.
+        """
+        with self._lock:
+            if name in self._loaded() or name in self._reserved:
+                return False
+            self._reserved.add(name)
+            return True
+
+    def settle(self, name: str) -> None:
+        with self._lock:
+            self._reserved.discard(name)
+            self._loaded().add(name)
+
+    def release(self, name: str) -> None:
+        with self._lock:
+            self._reserved.discard(name)
+
+    def ensure_dir(self, directory: Path) -> None:
+        with self._lock:
+            if directory not in self._made:
+                directory.mkdir(parents=True, exist_ok=True)
+                self._made.add(directory)
+
+
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+
+def _fsync_dir(directory: Path) -> None:
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _place(tmp: Path, target: Path) -> bool:
+    """
+    Move ``tmp`` to ``target`` unless ``target`` exists; True if placed.
+    """
+    try:
+        os.link(tmp, target)
+    except FileExistsError:
+        os.unlink(tmp)
+        return False
+    except OSError:
+        # No hard links on this filesystem: rename, checking first.
+        if os.path.lexists(target):
+            os.unlink(tmp)
+            return False
+        os.rename(tmp, target)
+        return True
+    os.unlink(tmp)
+    return True
+
+
+@attr.define(frozen=True)
+class _Pending:
+    fd: int
+    tmp: Path
+    directory: Path
+    filename: str
+    index: _OutputIndex
+    source_label: str
+    call_ulid: str
+
+
+class _GroupCommit:
+    """
+    Atomic note writes with grouped fsync.
+
+    Each note is written to a hidden temp file beside its target. Every
+    ``every`` notes, or ``interval_ms`` after the oldest pending one (a
+    background flusher thread watches the deadline), the pending temps are
+    fdatasync'ed, moved into place and each directory fsync'ed once. With
+    ``fsync`` off, temps are moved into place straight away.
+
+    Errors from a background commit are raised by the next ``write`` or
+    ``close``.
+    """
+
+    def __init__(self, *, fsync: bool, every: int, interval_ms: float) -> None:
+        self.fsync = fsync
+        self.every = every
+        self.interval = interval_ms / 1000.0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._pending: list[_Pending] = []
+        self._oldest = 0.0
+        self._counter = itertools.count()
+        self._flusher: threading.Thread | None = None
+        self._stopping = False
+        self._error: BaseException | None = None
+
+    def _stage(
+        self,
+        index: _OutputIndex,
+        directory: Path,
+        filename: str,
+        text: str,
+        *,
+        source_label: str,
+        call_ulid: str,
+    ) -> _Pending:
+        tmp = directory / f".{filename}.{os.getpid()}-{next(self._counter)}.tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        try:
+            data = text.encode("utf-8")
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        except BaseException:
+            os.close(fd)
+            os.unlink(tmp)
+            raise
+        return _Pending(
+            fd, tmp, directory, filename, index, source_label, call_ulid
+        )
+
+    def write(
+        self,
+        index: _OutputIndex,
+        directory: Path,
+        filename: str,
+        text: str,
+        *,
+        source_label: str,
+        call_ulid: str,
+    ) -> None:
+        """
+        Queue a note; it reaches its final name at the next commit.
+        """
+        entry = self._stage(
+            index,
+            directory,
+            filename,
+            text,
+            source_label=source_label,
+            call_ulid=call_ulid,
+        )
+        with self._lock:
+            self._raise_error()
+            if not self._pending:
+                self._oldest = time.monotonic()
+                self._wakeup.notify()
+            self._pending.append(entry)
+            if not self.fsync or len(self._pending) >= self.every:
+                self._commit_locked()
+            elif self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._flush_loop,
+                    name="makenewfile-sync",
+                    daemon=True,
+                )
+                self._flusher.start()
+
+    def write_now(
+        self,
+        index: _OutputIndex,
+        directory: Path,
+        filename: str,
+        text: str,
+    ) -> bool:
+        """
+        Write and commit one note immediately; True if it was placed.
+        """
+        entry = self._stage(
+            index,
+            directory,
+            filename,
+            text,
+            source_label="unknown",
+            call_ulid="unknown",
+        )
+        with self._lock:
+            return self._commit_entries([entry], report=False)[0]
+
+    def _flush_loop(self) -> None:
+        with self._wakeup:
+            while not self._stopping:
+                if not self._pending:
+                    self._wakeup.wait()
+                    continue
+                remaining = self._oldest + self.interval - time.monotonic()
+                if remaining > 0:
+                    self._wakeup.wait(remaining)
+                    continue
+                try:
+                    self._commit_locked()
+                except BaseException as exc:
+                    self._error = exc
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def close(self) -> None:
+        """
+        Commit everything pending and stop the flusher thread.
+        """
+        with self._lock:
+            self._stopping = True
+            self._wakeup.notify()
+            flusher, self._flusher = self._flusher, None
+        if flusher is not None:
+            flusher.join()
+        with self._lock:
+            self._stopping = False
+            self._commit_locked()
+            self._raise_error()
+
+    def _commit_locked(self) -> None:
+        pending, self._pending = self._pending, []
+        self._commit_entries(pending, report=True)
+
+    def _commit_entries(self, pending: list[_Pending], *, report: bool) -> list[bool]:
+        if not pending:
+            return []
+        try:
+            if self.fsync:
+                with stage_profile.stage("fsync"):
+                    for entry in pending:
+                        _fdatasync(entry.fd)
+        finally:
+            for entry in pending:
+                os.close(entry.fd)
+
+        placed: list[bool] = []
+        directories: set[Path] = set()
+        for entry in pending:
+            if _place(entry.tmp, entry.directory / entry.filename):
+                directories.add(entry.directory)
+                placed.append(True)
+            else:
+                placed.append(False)
+                if report:
+                    _log_item_error(
+                        reason="file exists; not overwriting",
+                        inferred_name=entry.filename,
+                        source_label=entry.source_label,
+                        call_ulid=entry.call_ulid,
+                    )
+            entry.index.settle(entry.filename)
+
+        if self.fsync:
+            with stage_profile.stage("fsync"):
+                for directory in directories:
+                    _fsync_dir(directory)
+        return placed
+
+
+@attr.define(frozen=True)
+class _Note:
+    record: dict
+    filename: str
+    shard: str
+    emitted_at: str
+    source_label: str
+    frontmatter: str
+    content: str
+
+
 @attr.define
 class MakefileAdapter:
     out_dir: Path = attr.field(converter=Path)
     dry_run: bool = False
+    workers: int = attr.field(default=1, validator=attr.validators.ge(1))
+    fsync: bool = True
+    sync_every: int = attr.field(default=64, validator=attr.validators.ge(1))
+    sync_interval_ms: float = 200.0
+    shard_depth: int = attr.field(default=0, validator=attr.validators.ge(0))
+    shard_by: str = attr.field(
+        default=SHARD_BY_HASH,
+        validator=attr.validators.in_(SHARD_MODES),
+    )
+    bundle: str | None = None
+    _indexes: dict[Path, _OutputIndex] = attr.field(factory=dict, init=False)
+    _commits: _GroupCommit = attr.field(init=False)
+
+    @shard_depth.validator
+    def _check_shard_depth(self, attribute: attr.Attribute, value: int) -> None:
+        limit = _SHARD_DEPTH_LIMITS.get(self.shard_by)
+        if limit is not None and value > limit:
+            raise ValueError(
+                f"shard_depth must be at most {limit} with shard_by={self.shard_by!r}"
+            )
+
+    @_commits.default
+    def _make_commits(self) -> _GroupCommit:
+        return _GroupCommit(
+            fsync=self.fsync,
+            every=self.sync_every,
+            interval_ms=self.sync_interval_ms,
+        )
 
     def run(self, *, in_path: str | None = None, source: TextIO | None = None) -> None:
         if source is not None:
             self._process(source)
             return
 
-        if in_path and in_path != "-":
-            with open(in_path, "r", encoding="utf-8") as fh:
-                self._process(fh)
-            return
-
-        self._process(sys.stdin)
+        # .gz/.zst input (file or stdin) is decompressed on a side thread.
+        # A stream that cannot be opened or decoded ends the run; notes
+        # already rendered are still committed.
+        try:
+            handle = ndjson_codec.open_text(in_path or "-", "r", sys.stdin)
+            try:
+                self._process(handle)
+            finally:
+                if handle is not sys.stdin:
+                    handle.close()
+        except ndjson_codec.NdjsonError as exc:
+            _log_item_error(
+                reason=f"unreadable input: {exc}",
+                inferred_name="",
+                source_label=in_path or "stdin",
+                call_ulid="unknown",
+            )
+            raise SystemExit(1) from exc
 
     def _process(self, stream: TextIO) -> None:
+        try:
+            if self.bundle:
+                self._process_bundle(stream)
+            elif self.workers > 1 and not self.dry_run:
+                self._process_pooled(stream)
+            else:
+                self._process_sequential(stream)
+        finally:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Sync and move into place every note still waiting for a commit.
+        """
+        self._commits.close()
+
+    def _process_sequential(self, stream: TextIO) -> None:
         for item in self.parse_ndjson(stream):
-            record = item.record
-            content = record.get(FIELD_CONTENT)
+            note = self._render(item.record)
+            if note is None:
+                continue
 
-            if not isinstance(content, str):
-                _log_item_error(
-                    reason="missing or invalid content",
-                    inferred_name="",
-                    source_label="unknown",
-                    call_ulid=_get_call_ulid(record),
+            with stage_profile.stage("file_write") as timing:
+                written = self._queue_note(note)
+                if written is not None and not self.dry_run:
+                    timing.add(len(note.frontmatter) + len(note.content))
+
+            self._report(note, written)
+
+    def _process_pooled(self, stream: TextIO) -> None:
+        """
+        Parse and render on this thread; write on ``workers`` threads.
+
+        A name is reserved here, in input order, before its write is
+        submitted, so the first record for a filename wins exactly as in
+        a sequential run.
+        """
+        index = self._output_index(self.out_dir)
+        window: deque[tuple[_Note, Future]] = deque()
+        limit = self.workers * 4
+
+        def drain(keep: int) -> None:
+            while len(window) > keep:
+                note, future = window.popleft()
+                self._report(note, future.result())
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for item in self.parse_ndjson(stream):
+                note = self._render(item.record)
+                if note is None:
+                    continue
+                if not index.reserve(note.filename):
+                    self._report(note, None)
+                    continue
+                window.append((note, pool.submit(self._write_note, index, note)))
+                drain(limit)
+            drain(0)
+
+    def _process_bundle(self, stream: TextIO) -> None:
+        """
+        Store rendered notes in ``bundle`` under their filename.
+        """
+        location = Path(self.bundle)
+        # A dry run only reads the bundle, and a missing one holds nothing.
+        if self.dry_run and not location.exists():
+            bundle = None
+        else:
+            bundle = _open_bundle(location, writable=not self.dry_run)
+        pending = 0
+        try:
+            for item in self.parse_ndjson(stream):
+                note = self._render(item.record)
+                if note is None:
+                    continue
+
+                with stage_profile.stage("bundle_write") as timing:
+                    if self.dry_run:
+                        stored = bundle is None or not bundle.has(note.filename)
+                    else:
+                        text = note.frontmatter + note.content
+                        stored = bundle.add(
+                            note.filename,
+                            text,
+                            emitted_at=note.emitted_at,
+                        )
+                        if stored:
+                            timing.add(len(text))
+                            pending += 1
+                        if pending >= self.sync_every:
+                            bundle.commit()
+                            pending = 0
+
+                self._report(note, location / note.filename if stored else None)
+        finally:
+            if bundle is not None:
+                bundle.close()
+
+    def explode(
+        self,
+        bundle_path: str,
+        *,
+        names: Iterable[str] | None = None,
+        pattern: str | None = None,
+    ) -> None:
+        """
+        Write notes from a bundle into ``out_dir`` as markdown files.
+
+        ``names`` and the fnmatch ``pattern`` select notes; with neither,
+        every note is written. Existing files are never overwritten.
+        """
+        bundle = _open_bundle(bundle_path, writable=False)
+        wanted = list(names) if names is not None else None
+        try:
+            if pattern:
+                candidates = wanted if wanted is not None else bundle.names()
+                wanted = [n for n in candidates if fnmatch.fnmatchcase(n, pattern)]
+
+            found: set[str] = set()
+            for bundled in bundle.iter_notes(wanted):
+                found.add(bundled.name)
+                if not _is_flat_name(bundled.name):
+                    _log_item_error(
+                        reason="bundle entry is not a flat filename",
+                        inferred_name=bundled.name,
+                        source_label=str(bundle_path),
+                        call_ulid="unknown",
+                    )
+                    continue
+                note = _Note(
+                    record={},
+                    filename=bundled.name,
+                    shard=self.shard_for(bundled.name, bundled.emitted_at),
+                    emitted_at=bundled.emitted_at,
+                    source_label=str(bundle_path),
+                    frontmatter="",
+                    content=bundled.text,
                 )
-                continue
+                with stage_profile.stage("file_write"):
+                    written = self._queue_note(note)
+                self._report(note, written)
+
+            for name in wanted or ():
+                if name not in found:
+                    _log_item_error(
+                        reason="not in bundle",
+                        inferred_name=name,
+                        source_label=str(bundle_path),
+                        call_ulid="unknown",
+                    )
+        finally:
+            bundle.close()
+            self.flush()
+
+    def _render(self, record: dict) -> _Note | None:
+        content = record.get(FIELD_CONTENT)
+
+        if not isinstance(content, str):
+            _log_item_error(
+                reason="missing or invalid content",
+                inferred_name="",
+                source_label="unknown",
+                call_ulid=_get_call_ulid(record),
+            )
+            return None
 
+        with stage_profile.stage("render"):
             source_blob = record.get(FIELD_SOURCE_BLOB)
             source_label = self.infer_source_label(source_blob, record)
             source_type = self._infer_source_type(source_label)
@@ -147,28 +673,45 @@ class MakefileAdapter:
                 source_type=source_type,
             )
 
-            written = self.write_markdown(
-                out_dir=self.out_dir,
-                filename=filename,
-                frontmatter=frontmatter,
-                content=content,
-                dry_run=self.dry_run,
+        return _Note(
+            record=record,
+            filename=filename,
+            shard=self.shard_for(filename, emitted_at),
+            emitted_at=emitted_at,
+            source_label=source_label,
+            frontmatter=frontmatter,
+            content=content,
+        )
+
+    def _report(self, note: _Note, written: Path | None) -> None:
+        if written is None:
+            _log_item_error(
+                reason="file exists; not overwriting",
+                inferred_name=note.filename,
+                source_label=note.source_label,
+                call_ulid=_get_call_ulid(note.record),
+            )
+        elif self.dry_run:
+            _log_item_error(
+                reason="dry-run: not written",
+                inferred_name=note.filename,
+                source_label=note.source_label,
+                call_ulid=_get_call_ulid(note.record),
             )
 
-            if written is None:
-                _log_item_error(
-                    reason="file exists; not overwriting",
-                    inferred_name=filename,
-                    source_label=source_label,
-                    call_ulid=_get_call_ulid(record),
-                )
-            elif self.dry_run:
-                _log_item_error(
-                    reason="dry-run: not written",
-                    inferred_name=filename,
-                    source_label=source_label,
-                    call_ulid=_get_call_ulid(record),
-                )
+    def _write_note(self, index: _OutputIndex, note: _Note) -> Path | None:
+        with stage_profile.stage("file_write") as timing:
+            written = self._write_reserved(
+                index,
+                note.filename,
+                note.frontmatter + note.content,
+                shard=note.shard,
+                source_label=note.source_label,
+                call_ulid=_get_call_ulid(note.record),
+            )
+            if written is not None:
+                timing.add(len(note.frontmatter) + len(note.content))
+        return written
 
     def parse_ndjson(self, stream: TextIO) -> Iterator[EmitItem]:
         """
@@ -182,7 +725,8 @@ class MakefileAdapter:
                 continue
 
             try:
-                obj = json.loads(raw)
+                with stage_profile.stage("ndjson_parse", len(line)):
+                    obj = ndjson_codec.loads(raw)
             except json.JSONDecodeError as exc:
                 _log_item_error(
                     reason=f"invalid JSON: {exc}",
@@ -323,18 +867,116 @@ class MakefileAdapter:
         frontmatter: str,
         content: str,
         dry_run: bool = False,
+        shard: str = "",
     ) -> Path | None:
-        target = out_dir / filename
+        """
+        Write one note atomically and durably; return its path once it is
+        in place, or None if the name is taken.
+        """
+        index = self._output_index(out_dir)
+        target = out_dir / shard / filename
+
+        if dry_run:
+            return None if index.exists(filename) else target
 
-        if target.exists():
+        if not index.reserve(filename):
             return None
+        try:
+            index.ensure_dir(target.parent)
+            placed = self._commits.write_now(
+                index,
+                target.parent,
+                filename,
+                frontmatter + content,
+            )
+        except BaseException:
+            index.release(filename)
+            raise
+        return target if placed else None
 
-        if dry_run:
-            return target
+    def _queue_note(self, note: _Note) -> Path | None:
+        """
+        Reserve and queue a note for the group commit.
+
+        Returns the path the note will have after the next commit (or, in
+        a dry run, would have), or None if the name is already taken.
+        """
+        index = self._output_index(self.out_dir)
+        if self.dry_run:
+            if index.exists(note.filename):
+                return None
+            return self.out_dir / note.shard / note.filename
+        if not index.reserve(note.filename):
+            return None
+        return self._write_reserved(
+            index,
+            note.filename,
+            note.frontmatter + note.content,
+            shard=note.shard,
+            source_label=note.source_label,
+            call_ulid=_get_call_ulid(note.record),
+        )
+
+    def shard_for(self, filename: str, emitted_at: str) -> str:
+        """
+        Relative subdirectory for a note; empty when sharding is off.
 
-        out_dir.mkdir(parents=True, exist_ok=True)
-        target.write_text(frontmatter + content, encoding="utf-8")
-        return target
+        ``hash`` uses two hex characters per level from a hash of the
+        filename; ``date`` uses the YYYY/MM/DD of ``emitted_at``.
+        """
+        if not self.shard_depth:
+            return ""
+        if self.shard_by == SHARD_BY_DATE:
+            parts = emitted_at[:10].split("-")
+        else:
+            digest = hashlib.blake2b(
+                filename.encode("utf-8"),
+                digest_size=_SHARD_DEPTH_LIMITS[SHARD_BY_HASH],
+            ).hexdigest()
+            parts = [digest[i : i + 2] for i in range(0, len(digest), 2)]
+        return "/".join(parts[: self.shard_depth])
+
+    def _output_index(self, out_dir: Path) -> _OutputIndex:
+        index = self._indexes.get(out_dir)
+        if index is None:
+            index = self._indexes[out_dir] = _OutputIndex(
+                out_dir,
+                recursive=self.shard_depth > 0,
+            )
+        return index
+
+    def _write_reserved(
+        self,
+        index: _OutputIndex,
+        filename: str,
+        text: str,
+        *,
+        shard: str = "",
+        source_label: str = "unknown",
+        call_ulid: str = "unknown",
+    ) -> Path | None:
+        """
+        Queue a reserved name on the group commit; return its final path.
+
+        The note reaches that path at the next commit, not on return; a
+        file created there by another process in the meantime is kept and
+        logged then.
+        """
+        directory = index.root / shard if shard else index.root
+        try:
+            index.ensure_dir(directory)
+            self._commits.write(
+                index,
+                directory,
+                filename,
+                text,
+                source_label=source_label,
+                call_ulid=call_ulid,
+            )
+        except BaseException:
+            index.release(filename)
+            raise
+        return directory / filename
 
     def _filename_from_source(self, source_label: str) -> str | None:
         if not source_label or source_label == "unknown":
@@ -404,21 +1046,101 @@ def _log_item_error(
     )
 
 
+def _open_bundle(path: Path | str, *, writable: bool) -> note_bundle.NoteBundle:
+    """
+    Open a note bundle; a missing or unreadable one ends the run.
+    """
+    try:
+        return note_bundle.open_bundle(path, writable=writable)
+    except note_bundle.NoteBundleError as exc:
+        _log_item_error(
+            reason=f"unreadable bundle: {exc}",
+            inferred_name="",
+            source_label=str(path),
+            call_ulid="unknown",
+        )
+        raise SystemExit(1) from exc
+
+
+def _is_flat_name(name: str) -> bool:
+    return bool(name) and name not in (".", "..") and Path(name).name == name
+
+
 def main(
     in_path: str | None = None,
     out_dir: str = ".",
     dry_run: bool = False,
+    profile: str | None = None,
+    workers: int = 1,
+    fsync: bool = True,
+    sync_every: int = 64,
+    sync_interval_ms: float = 200.0,
+    shard_depth: int = 0,
+    shard_by: str = SHARD_BY_HASH,
+    bundle: str | None = None,
 ) -> None:
-    adapter = MakefileAdapter(out_dir=Path(out_dir), dry_run=dry_run)
+    if profile:
+        stage_profile.enable(profile, label="makenewfile")
+    adapter = MakefileAdapter(
+        out_dir=Path(out_dir),
+        dry_run=dry_run,
+        workers=workers,
+        fsync=fsync,
+        sync_every=sync_every,
+        sync_interval_ms=sync_interval_ms,
+        shard_depth=shard_depth,
+        shard_by=shard_by,
+        bundle=bundle,
+    )
     adapter.run(in_path=in_path)
 
 
+def explode(
+    bundle: str,
+    out_dir: str = ".",
+    names: str | list[str] | tuple[str, ...] | None = None,
+    glob: str | None = None,
+    dry_run: bool = False,
+    profile: str | None = None,
+    fsync: bool = True,
+    sync_every: int = 64,
+    sync_interval_ms: float = 200.0,
+    shard_depth: int = 0,
+    shard_by: str = SHARD_BY_HASH,
+) -> None:
+    """
+    Materialize notes from a bundle written with ``--bundle``.
+
+    ``names`` is a comma-separated string or a list of filenames; ``glob``
+    is an fnmatch pattern on the filename. With neither, every note is
+    written.
+    """
+    if profile:
+        stage_profile.enable(profile, label="makenewfile.explode")
+    if isinstance(names, str):
+        names = [name.strip() for name in names.split(",") if name.strip()]
+    adapter = MakefileAdapter(
+        out_dir=Path(out_dir),
+        dry_run=dry_run,
+        fsync=fsync,
+        sync_every=sync_every,
+        sync_interval_ms=sync_interval_ms,
+        shard_depth=shard_depth,
+        shard_by=shard_by,
+    )
+    adapter.explode(bundle, names=names, pattern=glob)
+
+
 if __name__ == "__main__":
-    fire.Fire(main)
+    if len(sys.argv) > 1 and sys.argv[1] == "explode":
+        fire.Fire(explode, command=sys.argv[2:])
+    else:
+        fire.Fire(main)
 
 
 __all__ = [
     "EmitItem",
     "MakefileAdapter",
+    "explode",
     "main",
 ]
@@ -0,0 +1,391 @@
+"""
+NDJSON codec shared by the adapters.
+
+Encodes and decodes with orjson when it is installed and falls back to the
+stdlib ``json`` module otherwise. ``NdjsonWriter`` batches encoded lines
+into one write per ``batch_size`` records; with ``flush_interval`` a
+partial batch is also written and flushed once that many seconds have
+passed, so a downstream reader in a pipeline is not left waiting.
+
+``open_text`` adds transparent compression: ``.gz`` and ``.zst`` outputs
+are compressed by extension, and inputs (stdin included) are recognised by
+their magic bytes. Codec work runs on a background thread that hands 1 MiB
+chunks through a bounded queue, so it overlaps with parsing and encoding.
+"""
+
+from __future__ import annotations
+
+from typing import Any, BinaryIO, Iterable, Iterator, TextIO
+import gzip
+import io
+import json
+import queue
+import threading
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+CODEC = "orjson" if orjson is not None else "json"
+
+
+class NdjsonError(ValueError):
+    pass
+
+
+if orjson is not None:
+
+    def dumps(record: Any) -> str:
+        return orjson.dumps(record).decode("utf-8")
+
+    def loads(text: str | bytes) -> Any:
+        return orjson.loads(text)
+
+else:
+
+    def dumps(record: Any) -> str:
+        return json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+
+    def loads(text: str | bytes) -> Any:
+        return json.loads(text)
+
+
+def iter_ndjson(stream: Iterable[str]) -> Iterator[dict[str, Any]]:
+    """
+    Yield one object per non-blank line; raise NdjsonError on bad input.
+    """
+    for line_no, line in enumerate(stream, 1):
+        raw = line.strip()
+        if not raw:
+            continue
+        try:
+            obj = loads(raw)
+        except ValueError as exc:
+            raise NdjsonError(f"Invalid JSON on line {line_no}: {exc}") from exc
+        if not isinstance(obj, dict):
+            raise NdjsonError(
+                f"Expected JSON object on line {line_no}, "
+                f"got {type(obj).__name__}"
+            )
+        yield obj
+
+
+class NdjsonWriter:
+    """
+    Buffered NDJSON writer over a text handle.
+
+    The handle is flushed, never closed, by ``close``.
+    """
+
+    def __init__(
+        self,
+        handle: TextIO,
+        *,
+        batch_size: int = 256,
+        flush_interval: float | None = None,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self._handle = handle
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._lines: list[str] = []
+        self._last_flush = time.monotonic()
+        self.records = 0
+
+    def __enter__(self) -> "NdjsonWriter":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def write(self, record: Any) -> None:
+        self._lines.append(dumps(record))
+        self.records += 1
+        if len(self._lines) >= self._batch_size:
+            self._write_batch()
+        elif (
+            self._flush_interval is not None
+            and time.monotonic() - self._last_flush >= self._flush_interval
+        ):
+            self.flush()
+
+    def write_many(self, records: Iterable[Any]) -> None:
+        for record in records:
+            self.write(record)
+
+    def _write_batch(self) -> None:
+        if self._lines:
+            self._lines.append("")
+            self._handle.write("\n".join(self._lines))
+            self._lines = []
+        if self._flush_interval is not None:
+            now = time.monotonic()
+            if now - self._last_flush >= self._flush_interval:
+                self._handle.flush()
+                self._last_flush = now
+
+    def flush(self) -> None:
+        self._write_batch()
+        self._handle.flush()
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        self.flush()
+
+
+COMPRESSION_GZIP = "gzip"
+COMPRESSION_ZSTD = "zstd"
+
+_MAGIC = (
+    (b"\x1f\x8b", COMPRESSION_GZIP),
+    (b"\x28\xb5\x2f\xfd", COMPRESSION_ZSTD),
+)
+_SUFFIXES = {
+    ".gz": COMPRESSION_GZIP,
+    ".zst": COMPRESSION_ZSTD,
+    ".zstd": COMPRESSION_ZSTD,
+}
+_CHUNK = 1 << 20
+_QUEUE_DEPTH = 8
+
+
+def _require_zstandard() -> None:
+    if zstandard is None:
+        raise NdjsonError("zstd streams need the zstandard package")
+
+
+def _sniff(buffer: BinaryIO) -> str | None:
+    peek = getattr(buffer, "peek", None)
+    if peek is None:
+        return None
+    head = peek(4)[:4]
+    for magic, compression in _MAGIC:
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+class _ThreadedReader(io.RawIOBase):
+    """
+    Raw stream of decompressed bytes produced on a background thread.
+    """
+
+    def __init__(
+        self,
+        source: BinaryIO,
+        compression: str,
+        *,
+        close_source: bool,
+    ) -> None:
+        if compression == COMPRESSION_ZSTD:
+            _require_zstandard()
+        self._source = source
+        self._compression = compression
+        self._close_source = close_source
+        self._queue: queue.Queue = queue.Queue(maxsize=_QUEUE_DEPTH)
+        self._stop = threading.Event()
+        self._chunk = memoryview(b"")
+        self._eof = False
+        self._thread = threading.Thread(
+            target=self._pump,
+            name=f"ndjson-{compression}-read",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _put(self, item: object) -> None:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _pump(self) -> None:
+        try:
+            if self._compression == COMPRESSION_ZSTD:
+                stream = zstandard.ZstdDecompressor().stream_reader(
+                    self._source,
+                    read_across_frames=True,
+                    closefd=False,
+                )
+            else:
+                stream = gzip.GzipFile(fileobj=self._source, mode="rb")
+            while not self._stop.is_set():
+                chunk = stream.read(_CHUNK)
+                if not chunk:
+                    break
+                self._put(chunk)
+        except Exception as exc:
+            self._put(exc)
+        else:
+            self._put(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while not self._chunk and not self._eof:
+            item = self._queue.get()
+            if isinstance(item, Exception):
+                self._eof = True
+                raise NdjsonError(
+                    f"Failed to decompress {self._compression} stream: {item}"
+                ) from item
+            if not item:
+                self._eof = True
+            self._chunk = memoryview(item)
+        n = min(len(buffer), len(self._chunk))
+        buffer[:n] = self._chunk[:n]
+        self._chunk = self._chunk[n:]
+        return n
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self._stop.set()
+        self._thread.join()
+        if self._close_source:
+            self._source.close()
+        super().close()
+
+
+class _ThreadedWriter(io.RawIOBase):
+    """
+    Raw sink whose bytes are compressed into ``target`` on a background
+    thread. Errors from the thread surface on the next write or at close.
+    """
+
+    def __init__(self, target: BinaryIO, compression: str) -> None:
+        if compression == COMPRESSION_ZSTD:
+            _require_zstandard()
+        self._target = target
+        self._compression = compression
+        self._queue: queue.Queue = queue.Queue(maxsize=_QUEUE_DEPTH)
+        self._error: Exception | None = None
+        self._thread = threading.Thread(
+            target=self._pump,
+            name=f"ndjson-{compression}-write",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _pump(self) -> None:
+        stream = None
+        try:
+            if self._compression == COMPRESSION_ZSTD:
+                stream = zstandard.ZstdCompressor().stream_writer(
+                    self._target,
+                    closefd=False,
+                )
+            else:
+                stream = gzip.GzipFile(fileobj=self._target, mode="wb")
+            while (chunk := self._queue.get()) is not None:
+                stream.write(chunk)
+            stream.close()
+        except Exception as exc:
+            self._error = exc
+            # Keep draining so the producer never blocks on a full queue.
+            while self._queue.get() is not None:
+                pass
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise NdjsonError(
+                f"Failed to compress {self._compression} stream: {self._error}"
+            ) from self._error
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        self._raise_error()
+        chunk = bytes(data)
+        self._queue.put(chunk)
+        return len(chunk)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._target.close()
+        super().close()
+        self._raise_error()
+
+
+def _text(raw: io.RawIOBase, mode: str) -> TextIO:
+    if mode == "r":
+        buffered: Any = io.BufferedReader(raw, buffer_size=_CHUNK)
+    else:
+        buffered = io.BufferedWriter(raw, buffer_size=_CHUNK)
+    return io.TextIOWrapper(buffered, encoding="utf-8")
+
+
+def open_text(path: str, mode: str, default: TextIO) -> TextIO:
+    """
+    Open an NDJSON stream for text ``"r"`` or ``"w"``; ``-`` is ``default``.
+
+    Compressed input is detected from its first bytes; output is compressed
+    when ``path`` ends in ``.gz`` or ``.zst``. Closing the returned handle
+    waits for the codec thread and closes the file.
+    """
+    if mode not in ("r", "w"):
+        raise ValueError(f"Unsupported mode {mode!r}")
+
+    if path == "-":
+        if mode == "w":
+            return default
+        buffer = getattr(default, "buffer", None)
+        if buffer is None or default.isatty():
+            return default
+        compression = _sniff(buffer)
+        if compression is None:
+            return default
+        return _text(
+            _ThreadedReader(buffer, compression, close_source=False),
+            mode,
+        )
+
+    if mode == "w":
+        compression = next(
+            (c for suffix, c in _SUFFIXES.items() if path.endswith(suffix)),
+            None,
+        )
+        if compression is None:
+            return open(path, "w", encoding="utf-8")
+        if compression == COMPRESSION_ZSTD:
+            _require_zstandard()
+        return _text(_ThreadedWriter(open(path, "wb"), compression), mode)
+
+    source = open(path, "rb")
+    compression = _sniff(source)
+    if compression is None:
+        return io.TextIOWrapper(source, encoding="utf-8")
+    try:
+        return _text(
+            _ThreadedReader(source, compression, close_source=True),
+            mode,
+        )
+    except NdjsonError:
+        source.close()
+        raise
+
+
+__all__ = [
+    "CODEC",
+    "NdjsonError",
+    "NdjsonWriter",
+    "dumps",
+    "iter_ndjson",
+    "loads",
+    "open_text",
+]
@@ -0,0 +1,206 @@
+"""
+Bundles of rendered notes for makenewfile.
+
+Instead of one markdown file per record, each rendered note (front matter
+plus content) is stored under its inferred filename in a single SQLite
+database or an uncompressed ``.tar`` archive. ``makenewfile explode``
+materializes a selection back into markdown files later.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Iterator
+import io
+import sqlite3
+import tarfile
+
+TAR_SUFFIX = ".tar"
+
+
+class NoteBundleError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class BundledNote:
+    name: str
+    text: str
+    emitted_at: str
+
+
+def _epoch(emitted_at: str) -> float:
+    try:
+        return datetime.fromisoformat(emitted_at.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return 0.0
+
+
+def _iso(epoch: float) -> str:
+    stamp = datetime.fromtimestamp(epoch, timezone.utc).isoformat()
+    return stamp.replace("+00:00", "Z")
+
+
+class SqliteNoteBundle:
+    """
+    Notes in a SQLite table keyed by filename.
+
+    Inserts are grouped into transactions; ``commit`` ends one. A bundle
+    opened with ``writable=False`` is opened read-only and never modified.
+    """
+
+    def __init__(self, path: Path | str, *, writable: bool = True) -> None:
+        self.path = Path(path)
+        if not writable:
+            self._conn = sqlite3.connect(
+                f"{self.path.resolve().as_uri()}?mode=ro",
+                uri=True,
+            )
+            row = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'notes'"
+            ).fetchone()
+            if row is None:
+                self._conn.close()
+                raise NoteBundleError(f"Not a note bundle: {self.path}")
+            return
+
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS notes (
+                name TEXT PRIMARY KEY,
+                emitted_at TEXT NOT NULL,
+                body TEXT NOT NULL
+            )
+            """
+        )
+
+    def has(self, name: str) -> bool:
+        row = self._conn.execute(
+            "SELECT 1 FROM notes WHERE name = ?",
+            (name,),
+        ).fetchone()
+        return row is not None
+
+    def add(self, name: str, text: str, *, emitted_at: str) -> bool:
+        """
+        Store a note unless ``name`` is taken; True if it was stored.
+        """
+        cur = self._conn.execute(
+            "INSERT OR IGNORE INTO notes (name, emitted_at, body) VALUES (?, ?, ?)",
+            (name, emitted_at, text),
+        )
+        return cur.rowcount == 1
+
+    def commit(self) -> None:
+        self._conn.commit()
+
+    def names(self) -> list[str]:
+        return [
+            row[0]
+            for row in self._conn.execute("SELECT name FROM notes ORDER BY name")
+        ]
+
+    def iter_notes(self, names: Iterable[str] | None = None) -> Iterator[BundledNote]:
+        if names is None:
+            rows = self._conn.execute(
+                "SELECT name, body, emitted_at FROM notes ORDER BY name"
+            )
+            for name, body, emitted_at in rows:
+                yield BundledNote(name, body, emitted_at)
+            return
+        for name in names:
+            row = self._conn.execute(
+                "SELECT body, emitted_at FROM notes WHERE name = ?",
+                (name,),
+            ).fetchone()
+            if row is not None:
+                yield BundledNote(name, row[0], row[1])
+
+    def close(self) -> None:
+        if self._conn.in_transaction:
+            self._conn.commit()
+        self._conn.close()
+
+
+class TarNoteBundle:
+    """
+    Notes as members of an uncompressed tar archive, appended in place.
+
+    Member mtimes carry ``emitted_at``; member names are unique.
+    """
+
+    def __init__(self, path: Path | str, *, writable: bool = True) -> None:
+        self.path = Path(path)
+        try:
+            self._tar = tarfile.open(self.path, "a" if writable else "r")
+        except tarfile.TarError as exc:
+            raise NoteBundleError(f"Cannot open tar bundle {self.path}: {exc}") from exc
+        self._names = set(self._tar.getnames())
+
+    def has(self, name: str) -> bool:
+        return name in self._names
+
+    def add(self, name: str, text: str, *, emitted_at: str) -> bool:
+        if name in self._names:
+            return False
+        data = text.encode("utf-8")
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = _epoch(emitted_at)
+        info.mode = 0o644
+        self._tar.addfile(info, io.BytesIO(data))
+        self._names.add(name)
+        return True
+
+    def commit(self) -> None:
+        self._tar.fileobj.flush()
+
+    def names(self) -> list[str]:
+        return sorted(self._names)
+
+    def iter_notes(self, names: Iterable[str] | None = None) -> Iterator[BundledNote]:
+        wanted = set(names) if names is not None else None
+        for member in self._tar.getmembers():
+            if not member.isfile():
+                continue
+            if wanted is not None and member.name not in wanted:
+                continue
+            fh = self._tar.extractfile(member)
+            text = fh.read().decode("utf-8") if fh is not None else ""
+            yield BundledNote(member.name, text, _iso(member.mtime))
+
+    def close(self) -> None:
+        self._tar.close()
+
+
+NoteBundle = SqliteNoteBundle | TarNoteBundle
+
+
+def open_bundle(path: Path | str, *, writable: bool = True) -> NoteBundle:
+    """
+    Open a note bundle; ``.tar`` paths are tar bundles, others SQLite.
+    """
+    path = Path(path)
+    if not writable and not path.exists():
+        raise NoteBundleError(f"Bundle not found: {path}")
+    if path.suffix == TAR_SUFFIX:
+        return TarNoteBundle(path, writable=writable)
+    try:
+        return SqliteNoteBundle(path, writable=writable)
+    except sqlite3.DatabaseError as exc:
+        raise NoteBundleError(f"Cannot open SQLite bundle {path}: {exc}") from exc
+
+
+__all__ = [
+    "BundledNote",
+    "NoteBundle",
+    "NoteBundleError",
+    "SqliteNoteBundle",
+    "TarNoteBundle",
+    "open_bundle",
+]
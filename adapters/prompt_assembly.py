@@ -0,0 +1,267 @@
+"""
+Prompt assembly for instruction sets.
+
+Expands an instruction set into rendered section text (global, context,
+batch) from the ``instruction_sets`` table and snippet records emitted by
+``emit_instructions``. Rendered sets are cached in an in-memory LRU with an
+optional on-disk tier, keyed by set ULID plus the sha256 of every member,
+so a changed snippet never serves stale text.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+import hashlib
+import json
+import os
+import tempfile
+
+from asc.store.sql.connect import connect
+from asc.instructions.slug_registry import resolve_instruction_ulid
+
+if __package__:
+    from .body_store import BodyStore, FIELD_CONTENT_REF, REF_PREFIX, decode_body
+else:
+    from body_store import BodyStore, FIELD_CONTENT_REF, REF_PREFIX, decode_body
+
+from asc.core.contracts import ensure_contracts_shapes
+
+ensure_contracts_shapes()
+from autoscribe_shapes.ndjson import (
+    FIELD_BATCH,
+    FIELD_CONTENT,
+    FIELD_CONTEXT,
+    FIELD_GLOBAL,
+    FIELD_SHA256,
+    FIELD_SLUG,
+)
+
+SECTIONS = (FIELD_GLOBAL, FIELD_CONTEXT, FIELD_BATCH)
+
+
+@dataclass(frozen=True)
+class SnippetBody:
+    sha256: str
+    content: str
+
+
+class PromptAssembler:
+    """
+    Render instruction sets to section text, with caching.
+
+    ``capacity`` bounds the in-memory LRU; ``cache_dir`` enables the disk
+    tier. Call ``update`` with fresh snippet records to pick up edits.
+    Set membership is read from SQL once per set and kept in memory; call
+    ``reload`` after the sets have been loaded again.
+    """
+
+    def __init__(
+        self,
+        snippets: dict[str, SnippetBody] | None = None,
+        *,
+        capacity: int = 256,
+        cache_dir: Path | str | None = None,
+        body_store: BodyStore | None = None,
+    ) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self._snippets: dict[str, SnippetBody] = dict(snippets or {})
+        self._capacity = capacity
+        self._cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self._body_store = body_store
+        self._memory: OrderedDict[str, dict[str, str]] = OrderedDict()
+        self._key_by_set: dict[str, str] = {}
+        self._sets: dict[str, tuple[str, dict[str, list[str]]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Iterable[dict[str, Any]],
+        **kwargs: Any,
+    ) -> "PromptAssembler":
+        assembler = cls(**kwargs)
+        assembler.update(records)
+        return assembler
+
+    @classmethod
+    def from_db(cls, **kwargs: Any) -> "PromptAssembler":
+        """
+        Build an assembler from the ``instruction_snippets`` table that
+        ``snippets sync`` maintains, resolving each ``content_ref`` from
+        the body store.
+        """
+        conn = connect()
+        try:
+            rows = conn.execute(
+                """
+                SELECT s.snippet_ulid, s.sha256, s.content_ref, b.codec, b.body
+                FROM instruction_snippets AS s
+                LEFT JOIN snippet_bodies AS b
+                    ON b.sha256 = substr(s.content_ref, ?)
+                """,
+                (len(REF_PREFIX) + 1,),
+            ).fetchall()
+        finally:
+            conn.close()
+        snippets = {}
+        for row in rows:
+            if row["body"] is None:
+                raise RuntimeError(f"No stored body for {row['content_ref']}")
+            snippets[row["snippet_ulid"]] = SnippetBody(
+                sha256=row["sha256"],
+                content=decode_body(row["codec"], row["body"], sha=row["sha256"]),
+            )
+        return cls(snippets, **kwargs)
+
+    def update(self, records: Iterable[dict[str, Any]]) -> None:
+        """
+        Load snippet records (slug, sha256, content) keyed by snippet ULID.
+
+        Records that carry ``content_ref`` are resolved through the body
+        store given at construction.
+        """
+        for record in records:
+            slug = record.get(FIELD_SLUG)
+            sha = record.get(FIELD_SHA256)
+            content = record.get(FIELD_CONTENT)
+            if not isinstance(slug, str) or not isinstance(sha, str):
+                raise RuntimeError("Snippet record needs slug and sha256")
+            ref = record.get(FIELD_CONTENT_REF)
+            if content is None and ref is not None and self._body_store:
+                content = self._body_store.get(ref)
+            if not isinstance(content, str):
+                raise RuntimeError(f"Snippet record {slug!r} has no content")
+            ulid = resolve_instruction_ulid(slug)
+            self._snippets[ulid] = SnippetBody(sha256=sha, content=content)
+        self._sets.clear()
+
+    def reload(self) -> None:
+        """
+        Forget cached set membership so the next assemble reads SQL again.
+        """
+        self._sets.clear()
+
+    def assemble(self, set_slug: str) -> dict[str, str]:
+        """
+        Return rendered text for each section of the named set.
+        """
+        loaded = self._sets.get(set_slug)
+        if loaded is None:
+            loaded = self._sets[set_slug] = self._load_set(set_slug)
+        set_ulid, members = loaded
+        key = self._cache_key(set_ulid, members)
+
+        cached = self._memory.get(key)
+        if cached is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return dict(cached)
+
+        cached = self._read_disk(key)
+        if cached is None:
+            self.misses += 1
+            cached = {
+                section: "\n\n".join(
+                    self._snippets[ulid].content.strip() for ulid in ulids
+                )
+                for section, ulids in members.items()
+            }
+            self._write_disk(key, cached)
+        else:
+            self.hits += 1
+
+        self._remember(set_ulid, key, cached)
+        return dict(cached)
+
+    def _load_set(self, set_slug: str) -> tuple[str, dict[str, list[str]]]:
+        conn = connect()
+        try:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT set_ulid, global_snippets, context_snippets, batch_snippets
+                FROM instruction_sets
+                WHERE slug = ?
+                """,
+                (set_slug,),
+            )
+            row = cur.fetchone()
+        finally:
+            conn.close()
+
+        if row is None:
+            raise KeyError(f"Unknown instruction set {set_slug!r}")
+
+        members = {
+            FIELD_GLOBAL: json.loads(row["global_snippets"] or "[]"),
+            FIELD_CONTEXT: json.loads(row["context_snippets"] or "[]"),
+            FIELD_BATCH: json.loads(row["batch_snippets"] or "[]"),
+        }
+        for ulids in members.values():
+            for ulid in ulids:
+                if ulid not in self._snippets:
+                    raise KeyError(
+                        f"Snippet {ulid} of set {set_slug!r} is not loaded"
+                    )
+        return row["set_ulid"], members
+
+    def _cache_key(self, set_ulid: str, members: dict[str, list[str]]) -> str:
+        h = hashlib.sha256(set_ulid.encode("utf-8"))
+        for section in SECTIONS:
+            h.update(b"\0" + section.encode("utf-8"))
+            for ulid in members[section]:
+                h.update(b"\0" + self._snippets[ulid].sha256.encode("utf-8"))
+        return h.hexdigest()
+
+    def _remember(self, set_ulid: str, key: str, rendered: dict[str, str]) -> None:
+        stale = self._key_by_set.get(set_ulid)
+        if stale is not None and stale != key:
+            self._memory.pop(stale, None)
+            self._drop_disk(stale)
+        self._key_by_set[set_ulid] = key
+
+        self._memory[key] = rendered
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._capacity:
+            self._memory.popitem(last=False)
+
+    def _disk_path(self, key: str) -> Path | None:
+        if self._cache_dir is None:
+            return None
+        return self._cache_dir / key[:2] / f"{key}.json"
+
+    def _read_disk(self, key: str) -> dict[str, str] | None:
+        path = self._disk_path(key)
+        if path is None:
+            return None
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write_disk(self, key: str, rendered: dict[str, str]) -> None:
+        path = self._disk_path(key)
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{key}.")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(rendered, fh, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def _drop_disk(self, key: str) -> None:
+        path = self._disk_path(key)
+        if path is not None:
+            path.unlink(missing_ok=True)
+
+
+__all__ = [
+    "PromptAssembler",
+    "SnippetBody",
+    "SECTIONS",
+]
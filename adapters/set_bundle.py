@@ -0,0 +1,217 @@
+"""
+Compiled instruction-set bundle.
+
+A bundle is a single read-only file holding every instruction set with its
+resolved snippet ULIDs, plus an open-addressing slug index. Readers mmap it
+and look a set up by slug without YAML, JSON or SQL.
+
+Layout (little-endian):
+
+    header   magic, version, set count, slot count, index and data offsets
+    index    ``slots`` entries of (slug hash u64, record offset u32, length u32)
+    data     records: set_ulid, slug, manifest_ref, then global, context and
+             batch ULID lists; strings are u16-length-prefixed UTF-8
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+
+BUNDLE_MAGIC = b"ASCSETB\x00"
+BUNDLE_VERSION = 1
+
+_HEADER = struct.Struct("<8sHHIIII4x")
+_SLOT = struct.Struct("<QII")
+_U16 = struct.Struct("<H")
+
+
+class BundleFormatError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class BundledSet:
+    set_ulid: str
+    slug: str
+    manifest_ref: str
+    global_snippets: tuple[str, ...]
+    context_snippets: tuple[str, ...]
+    batch_snippets: tuple[str, ...]
+
+
+def _slug_hash(slug: str) -> int:
+    digest = hashlib.blake2b(slug.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _slot_count(count: int) -> int:
+    slots = 8
+    while slots < count * 2:
+        slots *= 2
+    return slots
+
+
+def _encode_str(value: str) -> bytes:
+    raw = value.encode("utf-8")
+    if len(raw) > 0xFFFF:
+        raise BundleFormatError(f"String too long for bundle: {value[:40]!r}")
+    return _U16.pack(len(raw)) + raw
+
+
+def _encode_record(item: BundledSet) -> bytes:
+    parts = [
+        _encode_str(item.set_ulid),
+        _encode_str(item.slug),
+        _encode_str(item.manifest_ref),
+    ]
+    for ulids in (item.global_snippets, item.context_snippets, item.batch_snippets):
+        parts.append(_U16.pack(len(ulids)))
+        parts.extend(_encode_str(ulid) for ulid in ulids)
+    return b"".join(parts)
+
+
+def write_bundle(path: Path | str, sets: Iterable[BundledSet]) -> int:
+    """
+    Write a bundle atomically and return the number of sets in it.
+    """
+    path = Path(path)
+    records = sorted(sets, key=lambda item: item.slug)
+    slots = _slot_count(len(records))
+    index_offset = _HEADER.size
+    data_offset = index_offset + slots * _SLOT.size
+
+    table: list[tuple[int, int, int]] = [(0, 0, 0)] * slots
+    data = bytearray()
+    for item in records:
+        encoded = _encode_record(item)
+        offset = data_offset + len(data)
+        data += encoded
+
+        key = _slug_hash(item.slug)
+        slot = key & (slots - 1)
+        while table[slot][2]:
+            slot = (slot + 1) & (slots - 1)
+        table[slot] = (key, offset, len(encoded))
+
+    header = _HEADER.pack(
+        BUNDLE_MAGIC,
+        BUNDLE_VERSION,
+        0,
+        len(records),
+        slots,
+        index_offset,
+        data_offset,
+    )
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(header)
+            fh.write(b"".join(_SLOT.pack(*entry) for entry in table))
+            fh.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+    return len(records)
+
+
+class SetBundle:
+    """
+    Read-only, memory-mapped view of a bundle.
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as fh:
+            # mmap refuses empty files; check the size before mapping.
+            if os.fstat(fh.fileno()).st_size < _HEADER.size:
+                raise BundleFormatError(f"Truncated bundle: {self.path}")
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic,
+            version,
+            _,
+            self._count,
+            self._slots,
+            self._index_offset,
+            _,
+        ) = _HEADER.unpack_from(self._map, 0)
+        if magic != BUNDLE_MAGIC:
+            self.close()
+            raise BundleFormatError(f"Not an instruction set bundle: {self.path}")
+        if version != BUNDLE_VERSION:
+            self.close()
+            raise BundleFormatError(
+                f"Unsupported bundle version {version} in {self.path}"
+            )
+
+    def __enter__(self) -> "SetBundle":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        self._map.close()
+
+    def get(self, slug: str) -> BundledSet | None:
+        key = _slug_hash(slug)
+        mask = self._slots - 1
+        slot = key & mask
+        for _ in range(self._slots):
+            entry_key, offset, length = _SLOT.unpack_from(
+                self._map,
+                self._index_offset + slot * _SLOT.size,
+            )
+            if length == 0:
+                return None
+            if entry_key == key:
+                item = self._decode(offset)
+                if item.slug == slug:
+                    return item
+            slot = (slot + 1) & mask
+        return None
+
+    def _read_str(self, offset: int) -> tuple[str, int]:
+        (length,) = _U16.unpack_from(self._map, offset)
+        start = offset + _U16.size
+        return self._map[start:start + length].decode("utf-8"), start + length
+
+    def _decode(self, offset: int) -> BundledSet:
+        set_ulid, offset = self._read_str(offset)
+        slug, offset = self._read_str(offset)
+        manifest_ref, offset = self._read_str(offset)
+
+        sections: list[tuple[str, ...]] = []
+        for _ in range(3):
+            (count,) = _U16.unpack_from(self._map, offset)
+            offset += _U16.size
+            ulids = []
+            for _ in range(count):
+                ulid, offset = self._read_str(offset)
+                ulids.append(ulid)
+            sections.append(tuple(ulids))
+
+        return BundledSet(set_ulid, slug, manifest_ref, *sections)
+
+
+__all__ = [
+    "BUNDLE_VERSION",
+    "BundleFormatError",
+    "BundledSet",
+    "SetBundle",
+    "write_bundle",
+]
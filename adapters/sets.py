@@ -7,19 +7,39 @@ named bundles. This loader snapshots those manifests into SQLite.
 
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
+from typing import Iterable, Iterator
+import hashlib
 import json
+import sqlite3
+import time
 
 import typer
 import yaml
 
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
+    inotify_flags = None
+
 from asc.core.timestamp import timestamp
 from asc.store.sql.connect import connect
 from asc.instructions.slug_registry import resolve_instruction_ulid
 
 from asc.core.contracts import ensure_contracts_shapes
 
+if __package__:
+    from . import sqlite_profile, stage_profile
+    from .set_bundle import BundledSet, write_bundle
+else:
+    import sqlite_profile
+    import stage_profile
+    from set_bundle import BundledSet, write_bundle
+
 ensure_contracts_shapes()
 from autoscribe_shapes.regex import SLUG_VALUE_RE, SLUG_HAS_ALPHA_RE
 from autoscribe_shapes.ndjson import (
@@ -37,12 +57,16 @@ from autoscribe_shapes.ndjson import (
 
 app = typer.Typer(help="Load instruction sets into SQLite")
 
+# libyaml's loader is several times faster; fall back when PyYAML lacks it.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 @dataclass(frozen=True)
 class LoadSummary:
     created: int
     updated: int
     skipped: int
+    removed: int = 0
 
     @property
     def total(self) -> int:
@@ -61,6 +85,17 @@ def _reject_db_path(db: Path | str | None) -> None:
         )
 
 
+_SET_SUFFIXES = (".yaml", ".yml")
+
+
+def _sqlite_profile() -> str:
+    try:
+        return sqlite_profile.profile_from_env()
+    except sqlite_profile.SqliteProfileError as exc:
+        typer.secho(str(exc), fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+
 def _find_set_files(root: Path) -> list[Path]:
     yaml_files = list(root.rglob("*.yaml")) + list(root.rglob("*.yml"))
     return sorted({p.resolve() for p in yaml_files})
@@ -101,7 +136,7 @@ def _extract_set_fields(
     *,
     root: Path,
 ) -> tuple[str, str, list[str], list[str], list[str]] | None:
-    data = yaml.safe_load(path.read_text(encoding="utf-8"))
+    data = yaml.load(path.read_text(encoding="utf-8"), Loader=_YAML_LOADER)
 
     if not isinstance(data, dict):
         raise RuntimeError(f"Instruction set YAML must be a mapping: {path}")
@@ -215,28 +250,111 @@ def _encode_snippets(items: list[str]) -> str | None:
     return json.dumps(items, separators=(",", ":"))
 
 
-def _load_instruction_sets(root: Path, *, report: bool = True) -> LoadSummary:
-    root = root.resolve()
+SetRow = tuple[str, str, list[str], list[str], list[str]]
 
-    if not root.is_dir():
-        typer.secho("Root path is not a directory", fg=typer.colors.RED)
-        raise typer.Exit(1)
 
-    files = _find_set_files(root)
-    if not files:
-        typer.secho("No instruction set YAML files found", fg=typer.colors.RED)
-        raise typer.Exit(1)
+class _SnippetResolver:
+    """
+    Slug -> ULID memo for snippet references, scoped to one load run.
+
+    The same snippet slugs recur across many sets; each distinct slug goes
+    through the registry once per run.
+    """
+
+    def __init__(self) -> None:
+        self._ulids: dict[str, str] = {}
+
+    def resolve_many(self, slugs: Iterable[str]) -> list[str]:
+        slugs = list(slugs)
+        for slug in dict.fromkeys(slugs):
+            if slug not in self._ulids:
+                self._ulids[slug] = resolve_instruction_ulid(slug)
+        return [self._ulids[slug] for slug in slugs]
+
+    def prime(self, rows: Iterable[SetRow]) -> None:
+        self.resolve_many(
+            slug
+            for _, _, global_snippets, context_snippets, batch_snippets in rows
+            for slug in (*global_snippets, *context_snippets, *batch_snippets)
+        )
+
+
+def _extract_set_fields_or_error(
+    path: Path,
+    *,
+    root: Path,
+) -> tuple[SetRow | None, str | None]:
+    try:
+        return _extract_set_fields(path, root=root), None
+    except Exception as exc:
+        return None, str(exc)
+
+
+def _extract_parallel(
+    paths: list[Path],
+    *,
+    root: Path,
+    jobs: int,
+) -> dict[Path, tuple[SetRow | None, str | None]]:
+    """
+    Parse manifests in a process pool.
+
+    Errors are returned rather than raised so the caller can report them
+    in sorted-path order, exactly as the serial loop would.
+    """
+    if not paths:
+        return {}
+    chunksize = max(1, len(paths) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        results = pool.map(
+            partial(_extract_set_fields_or_error, root=root),
+            paths,
+            chunksize=chunksize,
+        )
+        return dict(zip(paths, results))
+
+
+def _collect_set_rows(
+    root: Path,
+    files: list[Path],
+    *,
+    cached: dict[Path, SetRow | None] | None = None,
+    jobs: int = 1,
+) -> dict[Path, SetRow | None]:
+    """
+    Extract fields for every manifest, in sorted-path order.
+
+    Paths present in ``cached`` reuse their stored fields instead of being
+    parsed. Duplicate slugs are checked across cached and parsed entries.
+    """
+    cached = cached or {}
+    parsed: dict[Path, tuple[SetRow | None, str | None]] = {}
+    if jobs > 1:
+        parsed = _extract_parallel(
+            [path for path in files if path not in cached],
+            root=root,
+            jobs=jobs,
+        )
 
     seen_slugs: dict[str, Path] = {}
-    rows: list[tuple[str, str, list[str], list[str], list[str]]] = []
+    entries: dict[Path, SetRow | None] = {}
 
     for path in files:
-        try:
-            fields = _extract_set_fields(path, root=root)
-        except Exception as exc:
-            typer.secho(str(exc), fg=typer.colors.RED)
-            raise typer.Exit(1)
+        if path in cached:
+            fields = cached[path]
+        elif path in parsed:
+            fields, error = parsed[path]
+            if error is not None:
+                typer.secho(error, fg=typer.colors.RED)
+                raise typer.Exit(1)
+        else:
+            try:
+                fields = _extract_set_fields(path, root=root)
+            except Exception as exc:
+                typer.secho(str(exc), fg=typer.colors.RED)
+                raise typer.Exit(1)
 
+        entries[path] = fields
         if fields is None:
             continue
 
@@ -249,123 +367,923 @@ def _load_instruction_sets(root: Path, *, report: bool = True) -> LoadSummary:
             )
             raise typer.Exit(1)
         seen_slugs[slug] = path
-        rows.append(fields)
 
-    conn = connect()
-    try:
-        cur = conn.cursor()
-        created = updated = skipped = 0
+    return entries
 
-        for (
-            slug,
-            manifest_ref,
-            global_snippets,
-            context_snippets,
-            batch_snippets,
-        ) in rows:
-            cur.execute(
-                "SELECT set_ulid FROM instruction_sets WHERE slug = ?",
-                (slug,),
-            )
-            row_by_slug = cur.fetchone()
-            existing_ulid = row_by_slug["set_ulid"] if row_by_slug else None
 
-            set_ulid = resolve_instruction_ulid(
-                slug,
-                existing_ulid=existing_ulid,
+def _sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _ensure_fingerprint_table(cur) -> None:
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS instruction_set_files (
+            root TEXT NOT NULL,
+            path TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            sha256 TEXT NOT NULL,
+            fields TEXT,
+            PRIMARY KEY (root, path)
+        )
+        """
+    )
+
+
+@dataclass(frozen=True)
+class _FingerprintPlan:
+    cached: dict[Path, SetRow | None]
+    stale: dict[Path, tuple[int, int, str]]
+    touched: list[tuple[int, int, str, str]]
+    removed: list[str]
+    # Slugs recorded for removed or rewritten manifests.
+    previous_slugs: set[str]
+
+
+def _decode_fields(value: str | None) -> SetRow | None:
+    if value is None:
+        return None
+    slug, manifest_ref, global_snippets, context_snippets, batch_snippets = (
+        json.loads(value)
+    )
+    return slug, manifest_ref, global_snippets, context_snippets, batch_snippets
+
+
+def _stored_set_files(cur, root: Path) -> set[Path]:
+    cur.execute(
+        "SELECT path FROM instruction_set_files WHERE root = ?",
+        (str(root),),
+    )
+    return {Path(row["path"]) for row in cur.fetchall()}
+
+
+def _expand_changed(changed: set[Path], stored: set[Path]) -> set[Path]:
+    """
+    Turn watcher paths into manifest paths.
+
+    A directory event stands for every manifest beneath it, both those on
+    disk now and those recorded in the fingerprint table.
+    """
+    expanded: set[Path] = set()
+    for path in changed:
+        if path.suffix in _SET_SUFFIXES:
+            expanded.add(path)
+            continue
+        if path.is_dir():
+            expanded.update(_find_set_files(path))
+        expanded.update(p for p in stored if path in p.parents)
+    return expanded
+
+
+def _plan_fingerprints(
+    cur,
+    root: Path,
+    files: list[Path],
+    *,
+    only: set[Path] | None = None,
+) -> _FingerprintPlan:
+    """
+    Compare manifests on disk with the stored fingerprints for ``root``.
+
+    Matching size and mtime_ns are trusted without reading the file; a stat
+    change falls back to sha256 so touched-but-identical files stay cached.
+    When ``only`` is given, stored paths outside it are trusted unchecked.
+    """
+    cur.execute(
+        """
+        SELECT path, size, mtime_ns, sha256, fields
+        FROM instruction_set_files
+        WHERE root = ?
+        """,
+        (str(root),),
+    )
+    stored = {row["path"]: row for row in cur.fetchall()}
+
+    cached: dict[Path, SetRow | None] = {}
+    stale: dict[Path, tuple[int, int, str]] = {}
+    touched: list[tuple[int, int, str, str]] = []
+    previous_slugs: set[str] = set()
+
+    for path in files:
+        row = stored.pop(str(path), None)
+        if row is not None and only is not None and path not in only:
+            cached[path] = _decode_fields(row["fields"])
+            continue
+
+        st = path.stat()
+        if (
+            row is not None
+            and row["size"] == st.st_size
+            and row["mtime_ns"] == st.st_mtime_ns
+        ):
+            cached[path] = _decode_fields(row["fields"])
+            continue
+
+        sha = _sha256_file(path)
+        if row is not None and row["sha256"] == sha:
+            cached[path] = _decode_fields(row["fields"])
+            touched.append((st.st_size, st.st_mtime_ns, str(root), str(path)))
+            continue
+
+        stale[path] = (st.st_size, st.st_mtime_ns, sha)
+        if row is not None:
+            fields = _decode_fields(row["fields"])
+            if fields is not None:
+                previous_slugs.add(fields[0])
+
+    for row in stored.values():
+        fields = _decode_fields(row["fields"])
+        if fields is not None:
+            previous_slugs.add(fields[0])
+
+    return _FingerprintPlan(
+        cached=cached,
+        stale=stale,
+        touched=touched,
+        removed=sorted(stored),
+        previous_slugs=previous_slugs,
+    )
+
+
+def _store_fingerprints(
+    cur,
+    root: Path,
+    plan: _FingerprintPlan,
+    entries: dict[Path, SetRow | None],
+) -> None:
+    if plan.stale:
+        cur.executemany(
+            """
+            INSERT INTO instruction_set_files
+            (root, path, size, mtime_ns, sha256, fields)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (root, path) DO UPDATE SET
+                size = excluded.size,
+                mtime_ns = excluded.mtime_ns,
+                sha256 = excluded.sha256,
+                fields = excluded.fields
+            """,
+            [
+                (
+                    str(root),
+                    str(path),
+                    size,
+                    mtime_ns,
+                    sha,
+                    None
+                    if entries[path] is None
+                    else json.dumps(entries[path], separators=(",", ":")),
+                )
+                for path, (size, mtime_ns, sha) in plan.stale.items()
+            ],
+        )
+    if plan.touched:
+        cur.executemany(
+            """
+            UPDATE instruction_set_files
+            SET size = ?, mtime_ns = ?
+            WHERE root = ? AND path = ?
+            """,
+            plan.touched,
+        )
+    if plan.removed:
+        cur.executemany(
+            "DELETE FROM instruction_set_files WHERE root = ? AND path = ?",
+            [(str(root), path) for path in plan.removed],
+        )
+
+
+def _delete_sets(cur, slugs: Iterable[str]) -> int:
+    """
+    Drop the sets with these slugs, and their member rows.
+    """
+    removed = 0
+    for slug in sorted(slugs):
+        cur.execute(
+            "SELECT set_ulid FROM instruction_sets WHERE slug = ?",
+            (slug,),
+        )
+        row = cur.fetchone()
+        if row is None:
+            continue
+        cur.execute(
+            "DELETE FROM instruction_set_members WHERE set_ulid = ?",
+            (row["set_ulid"],),
+        )
+        cur.execute(
+            "DELETE FROM instruction_sets WHERE set_ulid = ?",
+            (row["set_ulid"],),
+        )
+        removed += 1
+    return removed
+
+
+MemberRow = tuple[str, list[str], list[str], list[str]]
+
+_MEMBER_SECTIONS = (FIELD_GLOBAL, FIELD_CONTEXT, FIELD_BATCH)
+
+
+def _decode_snippets(blob: str | None) -> list[str]:
+    if not blob:
+        return []
+    return json.loads(blob)
+
+
+def _member_params(rows: Iterable[MemberRow]) -> list[tuple[str, str, int, str]]:
+    params: list[tuple[str, str, int, str]] = []
+    for set_ulid, *sections in rows:
+        for section, ulids in zip(_MEMBER_SECTIONS, sections):
+            params.extend(
+                (set_ulid, section, position, snippet_ulid)
+                for position, snippet_ulid in enumerate(ulids)
             )
+    return params
+
+
+def _has_members_table(cur) -> bool:
+    cur.execute(
+        """
+        SELECT 1 FROM sqlite_master
+        WHERE type = 'table' AND name = 'instruction_set_members'
+        """
+    )
+    return cur.fetchone() is not None
 
-            global_ulids = [resolve_instruction_ulid(s) for s in global_snippets]
-            context_ulids = [resolve_instruction_ulid(s) for s in context_snippets]
-            batch_ulids = [resolve_instruction_ulid(s) for s in batch_snippets]
 
-            global_blob = _encode_snippets(global_ulids)
-            context_blob = _encode_snippets(context_ulids)
-            batch_blob = _encode_snippets(batch_ulids)
+def _ensure_members_table(cur) -> None:
+    """
+    Create instruction_set_members on first use and backfill it.
+
+    The table mirrors the JSON snippet columns of instruction_sets, one row
+    per (set, section, position), with an index on snippet_ulid for reverse
+    lookups.
+    """
+    if _has_members_table(cur):
+        return
 
+    cur.execute(
+        """
+        CREATE TABLE instruction_set_members (
+            set_ulid TEXT NOT NULL,
+            section TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            snippet_ulid TEXT NOT NULL,
+            PRIMARY KEY (set_ulid, section, position)
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE INDEX instruction_set_members_snippet
+        ON instruction_set_members (snippet_ulid)
+        """
+    )
+
+    cur.execute(
+        """
+        SELECT set_ulid, global_snippets, context_snippets, batch_snippets
+        FROM instruction_sets
+        """
+    )
+    backfill = [
+        (
+            row["set_ulid"],
+            _decode_snippets(row["global_snippets"]),
+            _decode_snippets(row["context_snippets"]),
+            _decode_snippets(row["batch_snippets"]),
+        )
+        for row in cur.fetchall()
+    ]
+    _insert_members(cur, backfill)
+
+
+def _insert_members(cur, rows: list[MemberRow]) -> None:
+    params = _member_params(rows)
+    if params:
+        cur.executemany(
+            """
+            INSERT INTO instruction_set_members
+            (set_ulid, section, position, snippet_ulid)
+            VALUES (?, ?, ?, ?)
+            """,
+            params,
+        )
+
+
+def _sync_members(cur, written: list[MemberRow]) -> None:
+    if not written:
+        return
+    cur.executemany(
+        "DELETE FROM instruction_set_members WHERE set_ulid = ?",
+        [(set_ulid,) for set_ulid, *_ in written],
+    )
+    _insert_members(cur, written)
+
+
+def _apply_set_rows(
+    cur,
+    rows: list[SetRow],
+    resolver: _SnippetResolver,
+    written: list[MemberRow],
+) -> LoadSummary:
+    created = updated = skipped = 0
+    resolver.prime(rows)
+
+    for (
+        slug,
+        manifest_ref,
+        global_snippets,
+        context_snippets,
+        batch_snippets,
+    ) in rows:
+        cur.execute(
+            "SELECT set_ulid FROM instruction_sets WHERE slug = ?",
+            (slug,),
+        )
+        row_by_slug = cur.fetchone()
+        existing_ulid = row_by_slug["set_ulid"] if row_by_slug else None
+
+        set_ulid = resolve_instruction_ulid(
+            slug,
+            existing_ulid=existing_ulid,
+        )
+
+        global_ulids = resolver.resolve_many(global_snippets)
+        context_ulids = resolver.resolve_many(context_snippets)
+        batch_ulids = resolver.resolve_many(batch_snippets)
+
+        global_blob = _encode_snippets(global_ulids)
+        context_blob = _encode_snippets(context_ulids)
+        batch_blob = _encode_snippets(batch_ulids)
+
+        cur.execute(
+            """
+            SELECT slug, manifest_ref, global_snippets, context_snippets, batch_snippets
+            FROM instruction_sets
+            WHERE set_ulid = ?
+            """,
+            (set_ulid,),
+        )
+        row = cur.fetchone()
+
+        if row is None:
+            cur.execute(
+                """
+                INSERT INTO instruction_sets
+                (set_ulid, slug, manifest_ref, global_snippets, context_snippets, batch_snippets, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    set_ulid,
+                    slug,
+                    manifest_ref,
+                    global_blob,
+                    context_blob,
+                    batch_blob,
+                    int(timestamp()),
+                ),
+            )
+            written.append((set_ulid, global_ulids, context_ulids, batch_ulids))
+            created += 1
+            continue
+
+        changed = (
+            row["slug"] != slug
+            or row["manifest_ref"] != manifest_ref
+            or row["global_snippets"] != global_blob
+            or row["context_snippets"] != context_blob
+            or row["batch_snippets"] != batch_blob
+        )
+
+        if changed:
             cur.execute(
                 """
-                SELECT slug, manifest_ref, global_snippets, context_snippets, batch_snippets
-                FROM instruction_sets
+                UPDATE instruction_sets
+                SET slug = ?, manifest_ref = ?, global_snippets = ?, context_snippets = ?, batch_snippets = ?
                 WHERE set_ulid = ?
                 """,
-                (set_ulid,),
+                (
+                    slug,
+                    manifest_ref,
+                    global_blob,
+                    context_blob,
+                    batch_blob,
+                    set_ulid,
+                ),
             )
-            row = cur.fetchone()
-
-            if row is None:
-                cur.execute(
-                    """
-                    INSERT INTO instruction_sets
-                    (set_ulid, slug, manifest_ref, global_snippets, context_snippets, batch_snippets, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        set_ulid,
-                        slug,
-                        manifest_ref,
-                        global_blob,
-                        context_blob,
-                        batch_blob,
-                        int(timestamp()),
-                    ),
-                )
-                created += 1
-                continue
+            written.append((set_ulid, global_ulids, context_ulids, batch_ulids))
+            updated += 1
+        else:
+            skipped += 1
 
-            changed = (
-                row["slug"] != slug
-                or row["manifest_ref"] != manifest_ref
-                or row["global_snippets"] != global_blob
-                or row["context_snippets"] != context_blob
-                or row["batch_snippets"] != batch_blob
+    return LoadSummary(created=created, updated=updated, skipped=skipped)
+
+
+def _apply_set_rows_bulk(
+    cur,
+    rows: list[SetRow],
+    resolver: _SnippetResolver,
+    written: list[MemberRow],
+) -> LoadSummary:
+    """
+    Same outcome as _apply_set_rows, with one read and batched writes.
+
+    Existing rows are read once and diffed in memory; inserts and updates
+    are applied with executemany inside the caller's transaction.
+    """
+    cur.execute(
+        """
+        SELECT set_ulid, slug, manifest_ref, global_snippets, context_snippets, batch_snippets
+        FROM instruction_sets
+        """
+    )
+    existing = cur.fetchall()
+    resolver.prime(rows)
+    ulid_by_slug = {row["slug"]: row["set_ulid"] for row in existing}
+    row_by_ulid = {row["set_ulid"]: row for row in existing}
+
+    inserts: list[tuple[str, str, str, str | None, str | None, str | None, int]] = []
+    updates: list[tuple[str, str, str | None, str | None, str | None, str]] = []
+    skipped = 0
+    created_at = int(timestamp())
+
+    for (
+        slug,
+        manifest_ref,
+        global_snippets,
+        context_snippets,
+        batch_snippets,
+    ) in rows:
+        set_ulid = resolve_instruction_ulid(
+            slug,
+            existing_ulid=ulid_by_slug.get(slug),
+        )
+
+        global_ulids = resolver.resolve_many(global_snippets)
+        context_ulids = resolver.resolve_many(context_snippets)
+        batch_ulids = resolver.resolve_many(batch_snippets)
+
+        global_blob = _encode_snippets(global_ulids)
+        context_blob = _encode_snippets(context_ulids)
+        batch_blob = _encode_snippets(batch_ulids)
+
+        row = row_by_ulid.get(set_ulid)
+        if row is None:
+            inserts.append(
+                (
+                    set_ulid,
+                    slug,
+                    manifest_ref,
+                    global_blob,
+                    context_blob,
+                    batch_blob,
+                    created_at,
+                )
             )
+            written.append((set_ulid, global_ulids, context_ulids, batch_ulids))
+            continue
 
-            if changed:
-                cur.execute(
-                    """
-                    UPDATE instruction_sets
-                    SET slug = ?, manifest_ref = ?, global_snippets = ?, context_snippets = ?, batch_snippets = ?
-                    WHERE set_ulid = ?
-                    """,
-                    (
-                        slug,
-                        manifest_ref,
-                        global_blob,
-                        context_blob,
-                        batch_blob,
-                        set_ulid,
-                    ),
+        changed = (
+            row["slug"] != slug
+            or row["manifest_ref"] != manifest_ref
+            or row["global_snippets"] != global_blob
+            or row["context_snippets"] != context_blob
+            or row["batch_snippets"] != batch_blob
+        )
+        if changed:
+            updates.append(
+                (
+                    slug,
+                    manifest_ref,
+                    global_blob,
+                    context_blob,
+                    batch_blob,
+                    set_ulid,
                 )
-                updated += 1
+            )
+            written.append((set_ulid, global_ulids, context_ulids, batch_ulids))
+        else:
+            skipped += 1
+
+    if inserts:
+        cur.executemany(
+            """
+            INSERT INTO instruction_sets
+            (set_ulid, slug, manifest_ref, global_snippets, context_snippets, batch_snippets, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            inserts,
+        )
+    if updates:
+        cur.executemany(
+            """
+            UPDATE instruction_sets
+            SET slug = ?, manifest_ref = ?, global_snippets = ?, context_snippets = ?, batch_snippets = ?
+            WHERE set_ulid = ?
+            """,
+            updates,
+        )
+
+    return LoadSummary(
+        created=len(inserts),
+        updated=len(updates),
+        skipped=skipped,
+    )
+
+
+def _load_instruction_sets(
+    root: Path,
+    *,
+    report: bool = True,
+    bulk: bool = False,
+    incremental: bool = False,
+    jobs: int = 1,
+    changed: set[Path] | None = None,
+) -> LoadSummary:
+    """
+    Load manifests under ``root``.
+
+    ``changed`` restricts an incremental load to the given paths (files or
+    directories); every other manifest is taken from the fingerprint table
+    without touching the filesystem.
+    """
+    root = root.resolve()
+
+    if jobs < 1:
+        typer.secho("--jobs must be at least 1", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    if not root.is_dir():
+        typer.secho("Root path is not a directory", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    if changed is None:
+        with stage_profile.stage("find"):
+            files = _find_set_files(root)
+        if not files:
+            typer.secho(
+                "No instruction set YAML files found",
+                fg=typer.colors.RED,
+            )
+            raise typer.Exit(1)
+
+    profile = _sqlite_profile()
+    conn = sqlite_profile.loader_connection(profile)
+    try:
+        cur = conn.cursor()
+        plan: _FingerprintPlan | None = None
+        only: set[Path] | None = None
+        if changed is not None:
+            incremental = True
+            _ensure_fingerprint_table(cur)
+            stored = _stored_set_files(cur, root)
+            only = _expand_changed(changed, stored)
+            files = sorted(
+                (stored - only) | {p for p in only if p.is_file()}
+            )
+        if incremental:
+            _ensure_fingerprint_table(cur)
+            with stage_profile.stage("fingerprint"):
+                plan = _plan_fingerprints(cur, root, files, only=only)
+
+        with stage_profile.stage("yaml"):
+            entries = _collect_set_rows(
+                root,
+                files,
+                cached=plan.cached if plan else None,
+                jobs=jobs,
+            )
+
+        if plan is None:
+            rows = [fields for fields in entries.values() if fields is not None]
+            unchanged = 0
+        else:
+            rows = [
+                entries[path]
+                for path in plan.stale
+                if entries[path] is not None
+            ]
+            unchanged = sum(
+                1 for fields in plan.cached.values() if fields is not None
+            )
+
+        with stage_profile.stage("sqlite"):
+            _ensure_members_table(cur)
+            resolver = _SnippetResolver()
+            written: list[MemberRow] = []
+            if bulk:
+                summary = _apply_set_rows_bulk(cur, rows, resolver, written)
             else:
-                skipped += 1
+                summary = _apply_set_rows(cur, rows, resolver, written)
+            _sync_members(cur, written)
 
-        conn.commit()
+            if plan is not None:
+                _store_fingerprints(cur, root, plan, entries)
+                # A slug still declared by some manifest (moved or renamed
+                # file) is kept; only sets no manifest declares are dropped.
+                live_slugs = {
+                    fields[0] for fields in entries.values() if fields is not None
+                }
+                removed = _delete_sets(cur, plan.previous_slugs - live_slugs)
+                summary = LoadSummary(
+                    created=summary.created,
+                    updated=summary.updated,
+                    skipped=summary.skipped + unchanged,
+                    removed=removed,
+                )
+
+            conn.commit()
+            sqlite_profile.finish_load(
+                conn,
+                profile,
+                writes=summary.created + summary.updated,
+            )
     finally:
         conn.close()
 
-    summary = LoadSummary(created=created, updated=updated, skipped=skipped)
     if report:
-        typer.secho(
-            f"{created} created, {updated} updated, {skipped} unchanged",
-            fg=typer.colors.GREEN,
+        message = (
+            f"{summary.created} created, {summary.updated} updated, "
+            f"{summary.skipped} unchanged"
         )
+        if summary.removed:
+            message += f", {summary.removed} removed"
+        typer.secho(message, fg=typer.colors.GREEN)
 
     return summary
 
 
+def _iter_polling_batches(
+    root: Path,
+    *,
+    interval: float,
+    debounce: float,
+) -> Iterator[set[Path]]:
+    def snapshot() -> dict[Path, tuple[int, int]]:
+        state: dict[Path, tuple[int, int]] = {}
+        for path in _find_set_files(root):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            state[path] = (st.st_size, st.st_mtime_ns)
+        return state
+
+    previous = snapshot()
+    while True:
+        time.sleep(interval)
+        current = snapshot()
+        if current == previous:
+            continue
+        while True:
+            time.sleep(debounce)
+            settled = snapshot()
+            if settled == current:
+                break
+            current = settled
+        yield {
+            path
+            for path in previous.keys() | current.keys()
+            if previous.get(path) != current.get(path)
+        }
+        previous = current
+
+
+def _iter_inotify_batches(root: Path, *, debounce: float) -> Iterator[set[Path]]:
+    inotify = INotify()
+    mask = (
+        inotify_flags.CREATE
+        | inotify_flags.DELETE
+        | inotify_flags.CLOSE_WRITE
+        | inotify_flags.MODIFY
+        | inotify_flags.MOVED_FROM
+        | inotify_flags.MOVED_TO
+    )
+    watched: dict[int, Path] = {}
+
+    def watch_tree(directory: Path) -> None:
+        for path in [directory, *directory.rglob("*")]:
+            if not path.is_dir():
+                continue
+            try:
+                watched[inotify.add_watch(path, mask)] = path
+            except OSError:
+                continue
+
+    watch_tree(root)
+    timeout_ms = int(debounce * 1000)
+    while True:
+        batch: set[Path] = set()
+        events = inotify.read()
+        # Keep reading until the tree has been quiet for one debounce window.
+        while events:
+            for event in events:
+                if event.mask & inotify_flags.Q_OVERFLOW:
+                    # Events were dropped: rescan everything, re-adding
+                    # watches for directories created meanwhile.
+                    watch_tree(root)
+                    batch.add(root)
+                    continue
+                if event.mask & inotify_flags.IGNORED:
+                    watched.pop(event.wd, None)
+                    continue
+                parent = watched.get(event.wd)
+                if parent is None or not event.name:
+                    continue
+                path = parent / event.name
+                if event.mask & inotify_flags.ISDIR and event.mask & (
+                    inotify_flags.CREATE | inotify_flags.MOVED_TO
+                ):
+                    watch_tree(path)
+                batch.add(path)
+            events = inotify.read(timeout=timeout_ms)
+        yield batch
+
+
+def _watch_instruction_sets(
+    root: Path,
+    *,
+    bulk: bool = False,
+    jobs: int = 1,
+    debounce: float = 0.25,
+    poll_interval: float = 0.5,
+) -> None:
+    """
+    Keep SQLite in step with the manifest tree.
+
+    Starts with an incremental load, then re-extracts only the manifests
+    touched by each debounced batch of filesystem events. Uses inotify
+    when inotify_simple is installed, otherwise polls with stat.
+    """
+    root = root.resolve()
+    _load_instruction_sets(root=root, bulk=bulk, incremental=True, jobs=jobs)
+
+    if INotify is not None:
+        batches = _iter_inotify_batches(root, debounce=debounce)
+    else:
+        typer.secho(
+            "inotify_simple not installed; polling for changes",
+            fg=typer.colors.YELLOW,
+        )
+        batches = _iter_polling_batches(
+            root,
+            interval=poll_interval,
+            debounce=debounce,
+        )
+
+    pending: set[Path] = set()
+    for batch in batches:
+        pending |= batch
+        if not pending:
+            continue
+        try:
+            _load_instruction_sets(
+                root=root,
+                bulk=bulk,
+                jobs=jobs,
+                changed=pending,
+            )
+        except (typer.Exit, OSError, sqlite3.Error) as exc:
+            if not isinstance(exc, typer.Exit):
+                typer.secho(str(exc), fg=typer.colors.RED)
+            typer.secho(
+                "Batch not applied; retrying on next change",
+                fg=typer.colors.YELLOW,
+            )
+            continue
+        pending = set()
+
+
+def set_members(set_ulid: str) -> dict[str, list[str]]:
+    """
+    Return the snippet ULIDs of one set, by section, in manifest order.
+
+    Read-only: before the loader has created instruction_set_members, every
+    section is empty.
+    """
+    conn = connect()
+    try:
+        cur = conn.cursor()
+        members: dict[str, list[str]] = {
+            section: [] for section in _MEMBER_SECTIONS
+        }
+        if not _has_members_table(cur):
+            return members
+        cur.execute(
+            """
+            SELECT section, snippet_ulid
+            FROM instruction_set_members
+            WHERE set_ulid = ?
+            ORDER BY section, position
+            """,
+            (set_ulid,),
+        )
+        for row in cur.fetchall():
+            members.setdefault(row["section"], []).append(row["snippet_ulid"])
+        return members
+    finally:
+        conn.close()
+
+
+def sets_using_snippet(snippet_ulid: str) -> list[str]:
+    """
+    Return the ULIDs of every set that references a snippet.
+
+    Read-only: before the loader has created instruction_set_members, no
+    set is returned.
+    """
+    conn = connect()
+    try:
+        cur = conn.cursor()
+        if not _has_members_table(cur):
+            return []
+        cur.execute(
+            """
+            SELECT DISTINCT set_ulid
+            FROM instruction_set_members
+            WHERE snippet_ulid = ?
+            ORDER BY set_ulid
+            """,
+            (snippet_ulid,),
+        )
+        return [row["set_ulid"] for row in cur.fetchall()]
+    finally:
+        conn.close()
+
+
 @app.command("sets")
 def load_sets_command(
     root: Path = typer.Argument(
         Path.cwd(),
         help="Root directory of instruction sets",
     ),
+    bulk: bool = typer.Option(
+        False,
+        "--bulk",
+        help="Read existing sets once and apply changes with batched writes",
+    ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="Skip manifests whose stored fingerprint is unchanged",
+    ),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        help="Parse manifests in N worker processes",
+    ),
+    watch: bool = typer.Option(
+        False,
+        "--watch",
+        help="Keep running and load manifests as they change",
+    ),
+    debounce: float = typer.Option(
+        0.25,
+        "--debounce",
+        help="Seconds of quiet before a watch batch is loaded",
+    ),
+    poll_interval: float = typer.Option(
+        0.5,
+        "--poll-interval",
+        help="Polling interval in seconds when inotify is unavailable",
+    ),
+    profile: str | None = typer.Option(
+        None,
+        "--profile",
+        help="Write per-stage timings as JSON to this file ('-' for stderr)",
+    ),
 ) -> None:
     """
     Load instruction sets into SQLite.
     """
-    _load_instruction_sets(root=root)
+    if profile:
+        stage_profile.enable(profile, label="sets")
+
+    if watch:
+        try:
+            _watch_instruction_sets(
+                root,
+                bulk=bulk,
+                jobs=jobs,
+                debounce=debounce,
+                poll_interval=poll_interval,
+            )
+        except KeyboardInterrupt:
+            pass
+        return
+
+    _load_instruction_sets(
+        root=root,
+        bulk=bulk,
+        incremental=incremental,
+        jobs=jobs,
+    )
 
 
 def load_sets(
@@ -373,21 +1291,93 @@ def load_sets(
     root: Path | str | None = None,
     report: bool = True,
     return_summary: bool = False,
+    bulk: bool = False,
+    incremental: bool = False,
+    jobs: int = 1,
+    profile: str | None = None,
 ) -> LoadSummary | None:
     _reject_db_path(db)
     if root is None:
         raise ValueError("root is required")
-    summary = _load_instruction_sets(root=Path(root), report=report)
+    if profile:
+        stage_profile.enable(profile, label="sets")
+    summary = _load_instruction_sets(
+        root=Path(root),
+        report=report,
+        bulk=bulk,
+        incremental=incremental,
+        jobs=jobs,
+    )
     if return_summary:
         return summary
     return None
 
 
+def _export_instruction_sets(output: Path, *, report: bool = True) -> int:
+    conn = connect()
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT set_ulid, slug, manifest_ref, global_snippets, context_snippets, batch_snippets
+            FROM instruction_sets
+            """
+        )
+        sets = [
+            BundledSet(
+                set_ulid=row["set_ulid"],
+                slug=row["slug"],
+                manifest_ref=row["manifest_ref"],
+                global_snippets=tuple(_decode_snippets(row["global_snippets"])),
+                context_snippets=tuple(_decode_snippets(row["context_snippets"])),
+                batch_snippets=tuple(_decode_snippets(row["batch_snippets"])),
+            )
+            for row in cur.fetchall()
+        ]
+    finally:
+        conn.close()
+
+    with stage_profile.stage("bundle_write"):
+        count = write_bundle(output, sets)
+    if report:
+        typer.secho(
+            f"{count} sets exported to {output}",
+            fg=typer.colors.GREEN,
+        )
+    return count
+
+
+@app.command("export")
+def export_sets_command(
+    output: Path = typer.Argument(
+        ...,
+        help="Path of the bundle file to write",
+    ),
+) -> None:
+    """
+    Compile loaded instruction sets into a memory-mappable bundle.
+    """
+    _export_instruction_sets(output)
+
+
+def export_sets(
+    output: Path | str,
+    db: Path | str | None = None,
+    report: bool = True,
+) -> int:
+    _reject_db_path(db)
+    return _export_instruction_sets(Path(output), report=report)
+
+
 def load_instruction_sets(
     db: Path | str | None = None,
     root: Path | str | None = None,
     report: bool = True,
     return_summary: bool = False,
+    bulk: bool = False,
+    incremental: bool = False,
+    jobs: int = 1,
+    profile: str | None = None,
 ) -> LoadSummary | None:
     """
     Backwards-compatible alias for load_sets.
@@ -397,6 +1387,10 @@ def load_instruction_sets(
         root=root,
         report=report,
         return_summary=return_summary,
+        bulk=bulk,
+        incremental=incremental,
+        jobs=jobs,
+        profile=profile,
     )
 
 
@@ -404,6 +1398,10 @@ __all__ = [
     "load_sets_command",
     "load_sets",
     "load_instruction_sets",
+    "export_sets_command",
+    "export_sets",
+    "set_members",
+    "sets_using_snippet",
     "InstructionSetLoaderNotImplemented",
     "LoadSummary",
 ]
@@ -0,0 +1,194 @@
+"""
+Persistent slug index for instruction markdown.
+
+An in-process alternative to the rg-based ``map_slugs``. The index is kept
+in a JSON file and refreshed incrementally: directories whose mtime is
+unchanged reuse their stored listing, and files whose (mtime_ns, size) are
+unchanged reuse their stored slug. Only new or edited files are read.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+import json
+import os
+import re
+import tempfile
+
+INDEX_VERSION = 1
+
+# Front matter is only scanned for a top-level ``slug:`` line.
+_SLUG_LINE_RE = re.compile(r"^slug:[ \t]*(.*?)[ \t]*$", re.MULTILINE)
+_FRONT_MATTER_LIMIT = 64 * 1024
+
+
+class SlugIndexError(RuntimeError):
+    pass
+
+
+def _read_slug(path: Path) -> str | None:
+    with path.open("rb") as fh:
+        head = fh.read(_FRONT_MATTER_LIMIT)
+    text = head.decode("utf-8", errors="replace").removeprefix("\ufeff")
+    if not text.startswith("---"):
+        return None
+    first, _, rest = text.partition("\n")
+    if first.rstrip() != "---":
+        return None
+
+    end = re.search(r"^(---|\.\.\.)[ \t]*$", rest, re.MULTILINE)
+    if end is None:
+        return None
+    match = _SLUG_LINE_RE.search(rest, 0, end.start())
+    if match is None:
+        return None
+
+    value = match.group(1)
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":
+        value = value[1:-1]
+    return value.strip() or None
+
+
+class SlugIndex:
+    """
+    Slug -> path map for the markdown files under ``root``.
+    """
+
+    def __init__(self, root: Path | str, index_path: Path | str) -> None:
+        self.root = Path(root).resolve()
+        self.index_path = Path(index_path).expanduser()
+        self._dirs: dict[str, dict[str, Any]] = {}
+        self._files: dict[str, list[Any]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if data.get("version") != INDEX_VERSION:
+            return
+        if data.get("root") != str(self.root):
+            return
+        self._dirs = data.get("dirs", {})
+        self._files = data.get("files", {})
+
+    def _save(self) -> None:
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": INDEX_VERSION,
+            "root": str(self.root),
+            "dirs": self._dirs,
+            "files": self._files,
+        }
+        fd, tmp = tempfile.mkstemp(
+            dir=self.index_path.parent,
+            prefix=f".{self.index_path.name}.",
+        )
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(payload, fh, separators=(",", ":"))
+        os.replace(tmp, self.index_path)
+
+    def _listing(self, directory: str) -> tuple[list[str], list[str], bool]:
+        mtime_ns = os.stat(directory).st_mtime_ns
+        known = self._dirs.get(directory)
+        if known is not None and known["mtime_ns"] == mtime_ns:
+            return known["files"], known["subdirs"], False
+
+        files: list[str] = []
+        subdirs: list[str] = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.name)
+                elif entry.name.endswith(".md") and entry.is_file():
+                    files.append(entry.name)
+        files.sort()
+        subdirs.sort()
+        self._dirs[directory] = {
+            "mtime_ns": mtime_ns,
+            "files": files,
+            "subdirs": subdirs,
+        }
+        return files, subdirs, True
+
+    def refresh(self) -> dict[str, Path]:
+        """
+        Bring the index up to date and return the slug -> path map.
+
+        Raises SlugIndexError when two files declare the same slug.
+        """
+        changed = False
+        seen_dirs: set[str] = set()
+        seen_files: set[str] = set()
+        slug_map: dict[str, Path] = {}
+
+        stack = [str(self.root)]
+        while stack:
+            directory = stack.pop()
+            try:
+                files, subdirs, relisted = self._listing(directory)
+            except FileNotFoundError:
+                continue
+            changed |= relisted
+            seen_dirs.add(directory)
+            stack.extend(os.path.join(directory, name) for name in subdirs)
+
+            for name in files:
+                path = os.path.join(directory, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                seen_files.add(path)
+
+                known = self._files.get(path)
+                if known is not None and known[:2] == [st.st_mtime_ns, st.st_size]:
+                    slug = known[2]
+                else:
+                    slug = _read_slug(Path(path))
+                    self._files[path] = [st.st_mtime_ns, st.st_size, slug]
+                    changed = True
+
+                if slug is None:
+                    continue
+                if slug in slug_map:
+                    raise SlugIndexError(
+                        f"Duplicate slug {slug!r} in {path} "
+                        f"(already seen in {slug_map[slug]})"
+                    )
+                slug_map[slug] = Path(path)
+
+        for stale in set(self._dirs) - seen_dirs:
+            del self._dirs[stale]
+            changed = True
+        for stale in set(self._files) - seen_files:
+            del self._files[stale]
+            changed = True
+
+        if changed:
+            self._save()
+        return slug_map
+
+    def write_instruction_index(self, output: Path | str) -> int:
+        """
+        Write ``{slug: absolute path}`` JSON, as in instructions.json.
+        """
+        slug_map = self.refresh()
+        payload = {slug: str(slug_map[slug]) for slug in sorted(slug_map)}
+        output = Path(output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(
+            json.dumps(payload, indent=2, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        return len(payload)
+
+
+__all__ = [
+    "SlugIndex",
+    "SlugIndexError",
+]
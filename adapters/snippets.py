@@ -1,15 +1,35 @@
 #!/home/jeremy/Python3.13Env/bin/python3.13
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 import hashlib
+import mmap
+import os
+import sqlite3
 import sys
-from typing import Any, TextIO
+from typing import Any, Iterable, Iterator, TextIO
 
 import fire
+import yaml
 
 from asc.core.rg_mapper import map_slugs, RgError
-from asc.io.markdown import MarkdownFile
-from asc.io.ndjson import iter_ndjson, emit_ndjson
+from asc.core.timestamp import timestamp
+from asc.instructions.slug_registry import resolve_instruction_ulid
+from asc.store.sql.connect import connect
+
+# Run as a script, the siblings are importable by bare name.
+if __package__:
+    from . import sqlite_profile, stage_profile
+    from .body_store import BodyStore, FIELD_CONTENT_REF
+    from .ndjson_codec import NdjsonError, NdjsonWriter, iter_ndjson, open_text
+    from .slug_index import SlugIndex, SlugIndexError
+else:
+    import sqlite_profile
+    import stage_profile
+    from body_store import BodyStore, FIELD_CONTENT_REF
+    from ndjson_codec import NdjsonError, NdjsonWriter, iter_ndjson, open_text
+    from slug_index import SlugIndex, SlugIndexError
 
 from asc.core.contracts import ensure_contracts_shapes
 
@@ -33,7 +53,73 @@ from autoscribe_shapes.ndjson import (
     INSTRUCTION_SNIPPET_TYPE,
 )
 
+# Files at least this large are hashed and decoded straight from an mmap.
+_MMAP_THRESHOLD = 1 << 20
 
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Partial NDJSON batches are flushed at least this often (seconds).
+_FLUSH_INTERVAL = 0.25
+
+
+class _HashCache:
+    """
+    Persistent sha256 cache keyed by (path, inode, size, mtime_ns).
+
+    A hit lets an unchanged file be recognised from one stat, without
+    reading it. The cache lives in its own SQLite file, not the ledger.
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS snippet_hashes (
+                path TEXT PRIMARY KEY,
+                inode INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                sha256 TEXT NOT NULL
+            )
+            """
+        )
+        self._pending: list[tuple[str, int, int, int, str]] = []
+
+    def get(self, path: Path, stat: os.stat_result) -> str | None:
+        row = self._conn.execute(
+            """
+            SELECT sha256 FROM snippet_hashes
+            WHERE path = ? AND inode = ? AND size = ? AND mtime_ns = ?
+            """,
+            (str(path), stat.st_ino, stat.st_size, stat.st_mtime_ns),
+        ).fetchone()
+        return row[0] if row else None
+
+    def put(self, path: Path, stat: os.stat_result, sha: str) -> None:
+        self._pending.append(
+            (str(path), stat.st_ino, stat.st_size, stat.st_mtime_ns, sha)
+        )
+        if len(self._pending) >= 500:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending:
+            self._conn.executemany(
+                """
+                INSERT OR REPLACE INTO snippet_hashes
+                (path, inode, size, mtime_ns, sha256)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                self._pending,
+            )
+            self._pending = []
+        self._conn.commit()
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
 
 
 @dataclass(frozen=True)
@@ -46,25 +132,50 @@ def _die(message: str) -> None:
     raise SystemExit(1)
 
 
-def sha256_of(path: Path) -> str:
-    h = hashlib.sha256()
-    with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            h.update(chunk)
-    return h.hexdigest()
-
-
-def _extract_snippet_fields(
-    path: Path,
+def _read_snippet(path: Path) -> tuple[str, str, os.stat_result]:
+    """
+    Read a snippet once; return (sha256, text, stat) from the same bytes.
+    """
+    with path.open("rb") as fh:
+        stat = os.fstat(fh.fileno())
+        if stat.st_size >= _MMAP_THRESHOLD:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                sha = hashlib.sha256(mapped).hexdigest()
+                text = str(mapped, "utf-8")
+        else:
+            data = fh.read()
+            sha = hashlib.sha256(data).hexdigest()
+            text = data.decode("utf-8")
+    return sha, text, stat
+
+
+def _split_front_matter(text: str, *, path: Path) -> tuple[dict[str, Any], str]:
+    text = text.removeprefix("\ufeff")
+    first, sep, rest = text.partition("\n")
+    if first.rstrip() != "---" or not sep:
+        return {}, text
+
+    offset = 0
+    for line in rest.splitlines(keepends=True):
+        if line.rstrip() in ("---", "..."):
+            data = yaml.load(rest[:offset], Loader=_YAML_LOADER)
+            if data is None:
+                data = {}
+            if not isinstance(data, dict):
+                raise RuntimeError(f"Front matter must be a mapping in {path}")
+            return data, rest[offset + len(line):]
+        offset += len(line)
+
+    raise RuntimeError(f"Unterminated front matter in {path}")
+
+
+def _snippet_fields(
+    front_matter: dict[str, Any],
+    body: Any,
     *,
+    path: Path,
     slug: str,
 ) -> tuple[str, str, str, str | None]:
-    doc = MarkdownFile(path).read(
-        require_sentinel=False,
-        allow_front_matter=True,
-    )
-    front_matter = doc.front_matter or {}
-
     # slug is the sole human-authored identifier for markdown instructions.
     fm_slug = front_matter.get("slug")
     if fm_slug and fm_slug != slug:
@@ -96,40 +207,59 @@ def _extract_snippet_fields(
         path=path,
     )
 
-    body = doc.body
     if not isinstance(body, str) or not body.strip():
         raise RuntimeError(f"Instruction body is empty in {path}")
 
     return slug, body, scope, schema_version
 
 
-def _scan_instruction_candidates(root: Path) -> list[dict[str, Any]]:
+def _map_instruction_slugs(
+    root: Path,
+    slug_index: str | None = None,
+) -> dict[str, Path]:
     root = root.resolve()
 
     if not root.is_dir():
         _die("Root path is not a directory")
 
+    if slug_index:
+        try:
+            with stage_profile.stage("slug_index"):
+                return SlugIndex(root, slug_index).refresh()
+        except (SlugIndexError, OSError) as exc:
+            _die(str(exc))
+
     try:
-        slug_map = map_slugs(root)
+        with stage_profile.stage("rg_scan"):
+            return map_slugs(root)
     except RgError as exc:
         _die(str(exc))
 
-    records: list[dict[str, Any]] = []
 
+def _iter_instruction_candidates(
+    slug_map: dict[str, Path],
+) -> Iterator[dict[str, Any]]:
     for slug, path in sorted(slug_map.items()):
-        if not path.exists():
+        try:
+            with stage_profile.stage("stat"):
+                stat = path.stat()
+        except FileNotFoundError:
             _die(f"File vanished: {path}")
-        stat = path.stat()
-        records.append(
-            {
-                FIELD_SLUG: slug,
-                FIELD_PATH: str(path),
-                FIELD_MTIME: float(stat.st_mtime),
-                FIELD_SIZE: int(stat.st_size),
-            }
-        )
+        yield {
+            FIELD_SLUG: slug,
+            FIELD_PATH: str(path),
+            FIELD_MTIME: float(stat.st_mtime),
+            FIELD_SIZE: int(stat.st_size),
+        }
+
 
-    return records
+def _scan_instruction_candidates(
+    root: Path,
+    slug_index: str | None = None,
+) -> list[dict[str, Any]]:
+    return list(
+        _iter_instruction_candidates(_map_instruction_slugs(root, slug_index))
+    )
 
 
 def check_instructions(
@@ -137,24 +267,40 @@ def check_instructions(
     output: str = "-",
     report: bool = True,
     return_summary: bool = False,
+    slug_index: str | None = None,
+    profile: str | None = None,
 ) -> CheckSummary | None:
     """
     Emit instruction candidates as NDJSON (slug/path/mtime/size).
+
+    Candidates are written as soon as they are stat'ed, so a downstream
+    emit_instructions can start before the scan finishes. ``slug_index``
+    names a persistent index file to scan in-process instead of running rg.
     """
-    records = _scan_instruction_candidates(Path(root))
-    summary = CheckSummary(total=len(records))
+    if profile:
+        stage_profile.enable(profile, label="check_instructions")
+    slug_map = _map_instruction_slugs(Path(root), slug_index)
+    total = 0
 
     out_handle = _open_text(output, "w", sys.stdout)
     is_tty = _is_tty(out_handle)
     emit_records = not is_tty
     report = report and is_tty
+    writer = NdjsonWriter(out_handle, flush_interval=_FLUSH_INTERVAL)
     try:
-        if emit_records:
-            emit_ndjson(out_handle, records)
+        for record in _iter_instruction_candidates(slug_map):
+            total += 1
+            if emit_records:
+                with stage_profile.stage("ndjson_write"):
+                    writer.write(record)
     finally:
+        # Records before a failure still reach the output.
+        with stage_profile.stage("ndjson_write"):
+            writer.close()
         if out_handle is not sys.stdout:
             out_handle.close()
 
+    summary = CheckSummary(total=total)
     if report:
         print(f"check_instructions: emitted {summary.total} candidates")
     if return_summary:
@@ -169,83 +315,270 @@ class EmitSummary:
     skipped: int
 
 
+@dataclass(frozen=True)
+class _EmitOutcome:
+    """
+    Result for one candidate; ``record`` is None when it was skipped.
+    """
+
+    record: dict[str, Any] | None
+    error: str | None = None
+    path: Path | None = None
+    sha: str | None = None
+    stat: os.stat_result | None = None
+
+
+def _emit_candidate(
+    record: dict[str, Any],
+    candidate: dict[str, Any],
+    prior_hash: str | None,
+    *,
+    default_schema_version: str,
+    report: bool,
+) -> _EmitOutcome:
+    """
+    Read, hash, parse and validate one candidate.
+
+    Safe to run on a worker thread: failures are returned as ``error`` so
+    the caller can fail fast in input order.
+    """
+    path = Path(candidate[FIELD_PATH])
+    decision = candidate.get(FIELD_DECISION)
+
+    try:
+        with stage_profile.stage("read_hash") as timing:
+            sha, text, stat = _read_snippet(path)
+            timing.add(stat.st_size)
+    except FileNotFoundError:
+        return _EmitOutcome(None, error=f"Instruction file not found: {path}")
+    except (OSError, UnicodeDecodeError) as exc:
+        return _EmitOutcome(None, error=str(exc))
+
+    if decision == DECISION_AMBIGUOUS:
+        if prior_hash and prior_hash == sha:
+            return _EmitOutcome(None, path=path, sha=sha, stat=stat)
+        if prior_hash is None and report:
+            print(
+                (
+                    "emit_instructions: "
+                    "missing last_hash for ambiguous record "
+                    f"{candidate[FIELD_SLUG]!r}"
+                ),
+                file=sys.stderr,
+            )
+
+    try:
+        with stage_profile.stage("markdown"):
+            front_matter, raw_body = _split_front_matter(text, path=path)
+            slug, body, scope, fm_schema = _snippet_fields(
+                front_matter,
+                raw_body,
+                path=path,
+                slug=candidate[FIELD_SLUG],
+            )
+        schema_version = _select_schema_version(
+            fm_schema,
+            record.get(FIELD_SCHEMA_VERSION),
+            default_schema_version,
+            path=path,
+            report=report,
+        )
+    except Exception as exc:
+        return _EmitOutcome(None, error=str(exc))
+
+    output_record = dict(record)
+    output_record.update(
+        {
+            FIELD_TYPE: INSTRUCTION_SNIPPET_TYPE,
+            FIELD_SLUG: slug,
+            FIELD_PATH: str(path),
+            FIELD_MTIME: float(stat.st_mtime),
+            FIELD_SIZE: int(stat.st_size),
+            FIELD_SHA256: sha,
+            FIELD_SCHEMA_VERSION: schema_version,
+            FIELD_CONTENT: body,
+            FIELD_SCOPE: scope,
+        }
+    )
+    return _EmitOutcome(output_record, path=path, sha=sha, stat=stat)
+
+
+def _iter_emit_outcomes(
+    records: Iterable[dict[str, Any]],
+    *,
+    default_schema_version: str,
+    report: bool,
+    cache: _HashCache | None = None,
+    jobs: int = 1,
+) -> Iterator[_EmitOutcome]:
+    """
+    Yield one outcome per candidate record, in input order.
+
+    With ``jobs`` > 1, candidates are processed on a bounded thread pool;
+    the first failing record (in input order) still ends the run via _die
+    after every earlier outcome has been yielded.
+    """
+    if jobs < 1:
+        _die("jobs must be at least 1")
+
+    pool = ThreadPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    window: deque[Future[_EmitOutcome] | _EmitOutcome] = deque()
+    limit = jobs * 4 if pool else 0
+
+    def drain(keep: int) -> Iterator[_EmitOutcome]:
+        while len(window) > keep:
+            item = window.popleft()
+            outcome = item.result() if isinstance(item, Future) else item
+            if outcome.error is not None:
+                _die(outcome.error)
+            if cache and outcome.sha is not None:
+                with stage_profile.stage("hash_cache"):
+                    cache.put(outcome.path, outcome.stat, outcome.sha)
+            yield outcome
+
+    try:
+        for record in records:
+            try:
+                candidate = _parse_candidate(record)
+            except SystemExit:
+                yield from drain(0)
+                raise
+            path = Path(candidate[FIELD_PATH])
+
+            try:
+                prior_hash = _coerce_hash(record.get(FIELD_LAST_HASH), path=path)
+            except Exception as exc:
+                window.append(_EmitOutcome(None, error=str(exc)))
+                yield from drain(0)
+                continue
+
+            # Unchanged ambiguous records are settled by hash before parsing.
+            if (
+                candidate.get(FIELD_DECISION) == DECISION_AMBIGUOUS
+                and prior_hash
+                and cache
+            ):
+                try:
+                    with stage_profile.stage("hash_cache"):
+                        cached_sha = cache.get(path, path.stat())
+                except FileNotFoundError:
+                    cached_sha = None
+                if cached_sha == prior_hash:
+                    window.append(_EmitOutcome(None))
+                    yield from drain(limit)
+                    continue
+
+            args = (record, candidate, prior_hash)
+            kwargs = {
+                "default_schema_version": default_schema_version,
+                "report": report,
+            }
+            if pool:
+                window.append(pool.submit(_emit_candidate, *args, **kwargs))
+            else:
+                window.append(_emit_candidate(*args, **kwargs))
+            yield from drain(limit)
+
+        yield from drain(0)
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+
+
+def _read_candidates(handle: TextIO) -> Iterator[dict[str, Any]]:
+    try:
+        yield from iter_ndjson(handle)
+    except NdjsonError as exc:
+        _die(str(exc))
+
+
 def emit_instructions(
     input: str = "-",
     output: str = "-",
     default_schema_version: str = DEFAULT_SNIPPET_SCHEMA_VERSION,
     report: bool = True,
     return_summary: bool = False,
+    hash_cache: str | None = None,
+    jobs: int = 1,
+    body_store: bool = False,
+    body_codec: str = "none",
+    profile: str | None = None,
 ) -> EmitSummary | None:
     """
     Read instruction candidates (NDJSON), resolve ambiguity, emit IR NDJSON.
+
+    With ``hash_cache`` (a SQLite file path), ambiguous candidates whose
+    cached hash matches ``last_hash`` are skipped after a single stat.
+    ``jobs`` > 1 reads and parses candidates concurrently; output keeps
+    input order. With ``body_store``, bodies go to the content-addressed
+    store in SQLite and records carry ``content_ref`` instead of content.
+    ``.gz``/``.zst`` input and output are (de)compressed transparently.
     """
+    if profile:
+        stage_profile.enable(profile, label="emit_instructions")
     in_handle = _open_text(input, "r", sys.stdin)
     out_handle = _open_text(output, "w", sys.stdout)
     is_tty = _is_tty(out_handle)
     emit_records = not is_tty
     report = report and is_tty
-
-    total = emitted = skipped = 0
-
+    cache = _HashCache(hash_cache) if hash_cache else None
+    store_conn = connect() if body_store else None
     try:
-        for record in iter_ndjson(in_handle):
-            total += 1
-            candidate = _parse_candidate(record)
-            path = Path(candidate[FIELD_PATH])
+        store = BodyStore(store_conn, codec=body_codec) if store_conn else None
+    except RuntimeError as exc:
+        store_conn.close()
+        _die(str(exc))
 
-            if not path.exists():
-                _die(f"Instruction file not found: {path}")
+    total = emitted = skipped = 0
+    # With a body store, records are held until their bodies are committed.
+    pending: list[dict[str, Any]] = []
 
-            try:
-                slug, body, scope, fm_schema = _extract_snippet_fields(
-                    path, slug=candidate[FIELD_SLUG]
-                )
-                schema_version = _select_schema_version(
-                    fm_schema,
-                    record.get(FIELD_SCHEMA_VERSION),
-                    default_schema_version,
-                    path=path,
-                    report=report,
-                )
-                prior_hash = _coerce_hash(record.get(FIELD_LAST_HASH), path=path)
-            except Exception as exc:
-                _die(str(exc))
+    writer = NdjsonWriter(out_handle, flush_interval=_FLUSH_INTERVAL)
 
-            sha = sha256_of(path)
-            decision = candidate.get(FIELD_DECISION)
+    def flush_pending() -> None:
+        if store_conn is not None:
+            with stage_profile.stage("sqlite"):
+                store_conn.commit()
+        if emit_records:
+            with stage_profile.stage("ndjson_write"):
+                writer.write_many(pending)
+        pending.clear()
 
-            if decision == DECISION_AMBIGUOUS:
-                if prior_hash and prior_hash == sha:
-                    skipped += 1
-                    continue
-                if prior_hash is None and report:
-                    print(
-                        (
-                            "emit_instructions: "
-                            f"missing last_hash for ambiguous record {slug!r}"
-                        ),
-                        file=sys.stderr,
+    try:
+        for outcome in _iter_emit_outcomes(
+            _read_candidates(in_handle),
+            default_schema_version=default_schema_version,
+            report=report,
+            cache=cache,
+            jobs=jobs,
+        ):
+            total += 1
+            if outcome.record is None:
+                skipped += 1
+                continue
+            output_record = outcome.record
+            if store is not None:
+                with stage_profile.stage("body_store"):
+                    output_record[FIELD_CONTENT_REF] = store.put(
+                        output_record[FIELD_SHA256],
+                        output_record.pop(FIELD_CONTENT),
                     )
-
-            stat = path.stat()
-            output_record = dict(record)
-            output_record.update(
-                {
-                    FIELD_TYPE: INSTRUCTION_SNIPPET_TYPE,
-                    FIELD_SLUG: slug,
-                    FIELD_PATH: str(path),
-                    FIELD_MTIME: float(stat.st_mtime),
-                    FIELD_SIZE: int(stat.st_size),
-                    FIELD_SHA256: sha,
-                    FIELD_SCHEMA_VERSION: schema_version,
-                    FIELD_CONTENT: body,
-                    FIELD_SCOPE: scope,
-                }
-            )
-            if emit_records:
-                emit_ndjson(out_handle, [output_record])
+            pending.append(output_record)
+            if store is None or len(pending) >= 256:
+                flush_pending()
             emitted += 1
+        flush_pending()
+    except SystemExit:
+        # Fail fast, but only after every earlier record is written.
+        flush_pending()
+        raise
     finally:
+        with stage_profile.stage("ndjson_write"):
+            writer.close()
+        if store_conn is not None:
+            store_conn.close()
+        if cache:
+            cache.close()
         if in_handle is not sys.stdin:
             in_handle.close()
         if out_handle is not sys.stdout:
@@ -264,10 +597,272 @@ def emit_instructions(
     return None
 
 
+@dataclass(frozen=True)
+class SyncSummary:
+    total: int
+    written: int
+    skipped: int
+    removed: int = 0
+
+
+_SNIPPET_COLUMNS = frozenset(
+    {
+        "snippet_ulid",
+        "slug",
+        "root",
+        "path",
+        "scope",
+        "schema_version",
+        "sha256",
+        "size",
+        "mtime",
+        "content_ref",
+        "updated_at",
+    }
+)
+
+
+def _ensure_snippet_table(cur) -> None:
+    # The table mirrors the snippet trees, so an older layout is rebuilt
+    # by the next sync instead of migrated.
+    columns = {
+        row[1] for row in cur.execute("PRAGMA table_info(instruction_snippets)")
+    }
+    if columns and columns != _SNIPPET_COLUMNS:
+        cur.execute("DROP TABLE instruction_snippets")
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS instruction_snippets (
+            snippet_ulid TEXT PRIMARY KEY,
+            slug TEXT NOT NULL UNIQUE,
+            root TEXT NOT NULL,
+            path TEXT NOT NULL,
+            scope TEXT NOT NULL,
+            schema_version TEXT NOT NULL,
+            sha256 TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            mtime REAL NOT NULL,
+            content_ref TEXT NOT NULL,
+            updated_at INTEGER NOT NULL
+        )
+        """
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_instruction_snippets_root "
+        "ON instruction_snippets (root)"
+    )
+
+
+def _upsert_snippets(
+    cur,
+    root: Path,
+    store: BodyStore,
+    records: list[dict[str, Any]],
+) -> None:
+    now = int(timestamp())
+    ulids = [resolve_instruction_ulid(record[FIELD_SLUG]) for record in records]
+    # A slug whose ULID changed would hit the slug UNIQUE constraint.
+    cur.executemany(
+        "DELETE FROM instruction_snippets WHERE slug = ? AND snippet_ulid != ?",
+        [(record[FIELD_SLUG], ulid) for record, ulid in zip(records, ulids)],
+    )
+    cur.executemany(
+        """
+        INSERT INTO instruction_snippets
+        (snippet_ulid, slug, root, path, scope, schema_version, sha256, size, mtime, content_ref, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (snippet_ulid) DO UPDATE SET
+            slug = excluded.slug,
+            root = excluded.root,
+            path = excluded.path,
+            scope = excluded.scope,
+            schema_version = excluded.schema_version,
+            sha256 = excluded.sha256,
+            size = excluded.size,
+            mtime = excluded.mtime,
+            content_ref = excluded.content_ref,
+            updated_at = excluded.updated_at
+        """,
+        [
+            (
+                ulid,
+                record[FIELD_SLUG],
+                str(root),
+                record[FIELD_PATH],
+                record[FIELD_SCOPE],
+                record[FIELD_SCHEMA_VERSION],
+                record[FIELD_SHA256],
+                record[FIELD_SIZE],
+                record[FIELD_MTIME],
+                store.put(record[FIELD_SHA256], record[FIELD_CONTENT]),
+                now,
+            )
+            for record, ulid in zip(records, ulids)
+        ],
+    )
+
+
+def _refresh_snippet_locations(
+    cur,
+    root: Path,
+    candidates: list[dict[str, Any]],
+) -> None:
+    """
+    Point unchanged snippets at the path/mtime/size they were found with.
+    """
+    cur.executemany(
+        """
+        UPDATE instruction_snippets
+        SET root = ?, path = ?, mtime = ?, size = ?
+        WHERE slug = ?
+        """,
+        [
+            (
+                str(root),
+                candidate[FIELD_PATH],
+                candidate[FIELD_MTIME],
+                candidate[FIELD_SIZE],
+                candidate[FIELD_SLUG],
+            )
+            for candidate in candidates
+        ],
+    )
+
+
+def sync(
+    root: Path | str = ".",
+    default_schema_version: str = DEFAULT_SNIPPET_SCHEMA_VERSION,
+    slug_index: str | None = None,
+    hash_cache: str | None = None,
+    jobs: int = 1,
+    batch_size: int = 500,
+    body_codec: str = "none",
+    report: bool = True,
+    return_summary: bool = False,
+    profile: str | None = None,
+) -> SyncSummary | None:
+    """
+    Scan, parse/hash and upsert instruction snippets in one process.
+
+    Runs check_instructions -> emit_instructions -> SQLite as a generator
+    pipeline with no NDJSON in between. Snippets whose sha256 matches the
+    stored row are skipped before parsing.
+
+    The ``instruction_snippets`` table mirrors each synced tree: rows
+    stored for ``root`` whose slug is no longer found under it are deleted,
+    and rows of other roots are left alone. Bodies go to the
+    content-addressed body store (``body_codec`` picks its compression) and
+    rows carry ``content_ref``; ``PromptAssembler.from_db`` resolves them.
+    ``AUTOSCRIBE_SQLITE_PROFILE`` tunes the connection as for the sets
+    loader.
+    """
+    if profile:
+        stage_profile.enable(profile, label="sync")
+    if batch_size < 1:
+        _die("batch_size must be at least 1")
+
+    root = Path(root).resolve()
+    try:
+        profile = sqlite_profile.profile_from_env()
+    except sqlite_profile.SqliteProfileError as exc:
+        _die(str(exc))
+    slug_map = _map_instruction_slugs(root, slug_index)
+    cache = _HashCache(hash_cache) if hash_cache else None
+    total = written = skipped = 0
+
+    conn = sqlite_profile.loader_connection(profile)
+    try:
+        try:
+            store = BodyStore(conn, codec=body_codec)
+        except RuntimeError as exc:
+            _die(str(exc))
+        cur = conn.cursor()
+        _ensure_snippet_table(cur)
+        cur.execute(
+            "SELECT slug, sha256 FROM instruction_snippets WHERE root = ?",
+            (str(root),),
+        )
+        stored = {row["slug"]: row["sha256"] for row in cur.fetchall()}
+        # Candidates in flight, in the order their outcomes come back.
+        located: deque[dict[str, Any]] = deque()
+
+        def candidates() -> Iterator[dict[str, Any]]:
+            # Stored hashes make every known snippet an ambiguous candidate.
+            for record in _iter_instruction_candidates(slug_map):
+                last_hash = stored.get(record[FIELD_SLUG])
+                if last_hash:
+                    record[FIELD_DECISION] = DECISION_AMBIGUOUS
+                    record[FIELD_LAST_HASH] = last_hash
+                located.append(dict(record))
+                yield record
+
+        batch: list[dict[str, Any]] = []
+        unchanged: list[dict[str, Any]] = []
+        for outcome in _iter_emit_outcomes(
+            candidates(),
+            default_schema_version=default_schema_version,
+            report=report,
+            cache=cache,
+            jobs=jobs,
+        ):
+            total += 1
+            candidate = located.popleft()
+            if outcome.record is None:
+                skipped += 1
+                unchanged.append(candidate)
+                if len(unchanged) >= batch_size:
+                    with stage_profile.stage("sqlite"):
+                        _refresh_snippet_locations(cur, root, unchanged)
+                    unchanged = []
+                continue
+            batch.append(outcome.record)
+            if len(batch) >= batch_size:
+                with stage_profile.stage("sqlite"):
+                    _upsert_snippets(cur, root, store, batch)
+                written += len(batch)
+                batch = []
+        with stage_profile.stage("sqlite"):
+            if batch:
+                _upsert_snippets(cur, root, store, batch)
+                written += len(batch)
+            if unchanged:
+                _refresh_snippet_locations(cur, root, unchanged)
+            gone = sorted(set(stored) - set(slug_map))
+            cur.executemany(
+                "DELETE FROM instruction_snippets WHERE root = ? AND slug = ?",
+                [(str(root), slug) for slug in gone],
+            )
+            conn.commit()
+            sqlite_profile.finish_load(conn, profile, writes=written + len(gone))
+    finally:
+        conn.close()
+        if cache:
+            cache.close()
+
+    summary = SyncSummary(
+        total=total,
+        written=written,
+        skipped=skipped,
+        removed=len(gone),
+    )
+    if report:
+        print(
+            (
+                "sync: "
+                f"total={total} written={written} skipped={skipped} "
+                f"removed={len(gone)}"
+            ),
+        )
+    if return_summary:
+        return summary
+    return None
+
+
 def _open_text(path: str, mode: str, default: TextIO) -> TextIO:
-    if path == "-":
-        return default
-    return open(path, mode, encoding="utf-8")
+    try:
+        return open_text(path, mode, default)
+    except NdjsonError as exc:
+        _die(str(exc))
 
 
 def _is_tty(handle: TextIO) -> bool:
@@ -383,11 +978,41 @@ def _coerce_hash(value: Any, *, path: Path) -> str | None:
     return value.strip()
 
 
+def build_instruction_index(
+    root: Path | str = ".",
+    slug_index: str = "",
+    output: str = "",
+    report: bool = True,
+) -> int:
+    """
+    Regenerate an instructions.json ({slug: path}) from the slug index.
+    """
+    if not slug_index:
+        _die("slug_index is required")
+    if not output:
+        _die("output is required")
+
+    root = Path(root).resolve()
+    if not root.is_dir():
+        _die("Root path is not a directory")
+
+    try:
+        count = SlugIndex(root, slug_index).write_instruction_index(output)
+    except (SlugIndexError, OSError) as exc:
+        _die(str(exc))
+
+    if report:
+        print(f"build_instruction_index: wrote {count} slugs to {output}")
+    return count
+
+
 def main() -> None:
     fire.Fire(
         {
             "check_instructions": check_instructions,
             "emit_instructions": emit_instructions,
+            "build_instruction_index": build_instruction_index,
+            "sync": sync,
         }
     )
 
@@ -399,6 +1024,9 @@ if __name__ == "__main__":
 __all__ = [
     "check_instructions",
     "emit_instructions",
+    "build_instruction_index",
+    "sync",
     "CheckSummary",
     "EmitSummary",
+    "SyncSummary",
 ]
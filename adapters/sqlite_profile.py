@@ -0,0 +1,72 @@
+"""
+Opt-in SQLite connection tuning for the bulk loaders.
+
+``AUTOSCRIBE_SQLITE_PROFILE`` selects a profile. ``default`` leaves the
+connection as ``connect()`` returns it; ``throughput`` switches to WAL with
+relaxed syncing, a larger page cache and mmap, and waits on a busy
+database instead of failing. Both ``sets`` and ``snippets sync`` open
+their connection through ``loader_connection``.
+"""
+
+from __future__ import annotations
+
+import os
+
+from asc.store.sql.connect import connect
+
+SQLITE_PROFILE_ENV = "AUTOSCRIBE_SQLITE_PROFILE"
+PROFILE_DEFAULT = "default"
+PROFILES: dict[str, tuple[str, ...]] = {
+    PROFILE_DEFAULT: (),
+    "throughput": (
+        "PRAGMA journal_mode = WAL",
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA cache_size = -65536",
+        "PRAGMA mmap_size = 268435456",
+        "PRAGMA busy_timeout = 5000",
+        "PRAGMA temp_store = MEMORY",
+    ),
+}
+# Tuned loads that write at least this many rows finish with PRAGMA optimize.
+OPTIMIZE_AFTER_WRITES = 500
+
+
+class SqliteProfileError(ValueError):
+    pass
+
+
+def profile_from_env() -> str:
+    profile = os.environ.get(SQLITE_PROFILE_ENV, "").strip().lower()
+    profile = profile or PROFILE_DEFAULT
+    if profile not in PROFILES:
+        raise SqliteProfileError(
+            f"Unknown {SQLITE_PROFILE_ENV} {profile!r}; "
+            f"expected one of {sorted(PROFILES)}"
+        )
+    return profile
+
+
+def loader_connection(profile: str):
+    conn = connect()
+    for pragma in PROFILES[profile]:
+        conn.execute(pragma)
+    return conn
+
+
+def finish_load(conn, profile: str, *, writes: int) -> None:
+    """
+    Run PRAGMA optimize after a large tuned load.
+    """
+    if profile != PROFILE_DEFAULT and writes >= OPTIMIZE_AFTER_WRITES:
+        conn.execute("PRAGMA optimize")
+
+
+__all__ = [
+    "OPTIMIZE_AFTER_WRITES",
+    "PROFILES",
+    "SQLITE_PROFILE_ENV",
+    "SqliteProfileError",
+    "finish_load",
+    "loader_connection",
+    "profile_from_env",
+]
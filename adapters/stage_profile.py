@@ -0,0 +1,132 @@
+"""
+Stage-timing profiler shared by the adapters.
+
+Adapters wrap named stages (``rg_scan``, ``yaml``, ``markdown``, ``hash``,
+``sqlite``, ``file_write``...) in ``stage(name)``. Until ``enable`` is
+called, ``stage`` hands back one shared no-op object, so profiling costs a
+function call when it is off. When enabled, wall time, call count and
+bytes are accumulated per stage and one JSON record is written to stderr
+(``-``) or a file at interpreter exit.
+
+Stages run on worker threads are summed, so a stage's seconds can exceed
+the run's wall time.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import sys
+import threading
+import time
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullStage":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+    def add(self, nbytes: int) -> None:
+        return None
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("_profiler", "_name", "_bytes", "_start")
+
+    def __init__(self, profiler: "StageProfiler", name: str, nbytes: int) -> None:
+        self._profiler = profiler
+        self._name = name
+        self._bytes = nbytes
+        self._start = 0.0
+
+    def __enter__(self) -> "_Stage":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._profiler._record(
+            self._name,
+            time.perf_counter() - self._start,
+            self._bytes,
+        )
+
+    def add(self, nbytes: int) -> None:
+        self._bytes += nbytes
+
+
+class StageProfiler:
+    def __init__(self, label: str) -> None:
+        self.label = label
+        self._lock = threading.Lock()
+        self._stats: dict[str, list[float]] = {}
+        self._started = time.perf_counter()
+
+    def stage(self, name: str, nbytes: int = 0) -> _Stage:
+        return _Stage(self, name, nbytes)
+
+    def _record(self, name: str, seconds: float, nbytes: int) -> None:
+        with self._lock:
+            entry = self._stats.get(name)
+            if entry is None:
+                entry = self._stats[name] = [0.0, 0, 0]
+            entry[0] += seconds
+            entry[1] += 1
+            entry[2] += nbytes
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stages = {
+                name: {
+                    "seconds": round(seconds, 6),
+                    "calls": int(calls),
+                    "bytes": int(nbytes),
+                }
+                for name, (seconds, calls, nbytes) in sorted(self._stats.items())
+            }
+        return {
+            "label": self.label,
+            "wall_seconds": round(time.perf_counter() - self._started, 6),
+            "stages": stages,
+        }
+
+    def write(self, target: str) -> None:
+        text = json.dumps(self.snapshot(), separators=(",", ":"))
+        if target == "-":
+            print(text, file=sys.stderr)
+            return
+        with open(target, "a", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+
+
+_active: StageProfiler | None = None
+
+
+def enable(target: str, *, label: str) -> StageProfiler:
+    """
+    Start profiling; the stats record goes to ``target`` at exit.
+    """
+    global _active
+    if _active is None:
+        _active = StageProfiler(label)
+        atexit.register(_active.write, target)
+    return _active
+
+
+def stage(name: str, nbytes: int = 0) -> _Stage | _NullStage:
+    if _active is None:
+        return _NULL_STAGE
+    return _active.stage(name, nbytes)
+
+
+__all__ = [
+    "StageProfiler",
+    "enable",
+    "stage",
+]
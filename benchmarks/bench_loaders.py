@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""Benchmark the instruction loaders against synthetic trees."""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_SIZES = (100, 10_000, 100_000)
+SNIPPETS_PER_SET = 6
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Time check_instructions, emit_instructions and load_sets on synthetic trees."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        help="Tree sizes (snippet files and set manifests each) (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--output",
+        default="-",
+        help="Write JSON results here; '-' for stdout (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=1,
+        help="Random seed for set membership (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--keep",
+        action="store_true",
+        help="Keep the generated trees and databases.",
+    )
+    ns = parser.parse_args()
+    if any(size < 1 for size in ns.sizes):
+        parser.error("--sizes must be positive")
+    return ns
+
+
+# ------------------------------------------------------------
+# Synthetic trees
+# ------------------------------------------------------------
+
+def _fan_out(root: Path, index: int) -> Path:
+    # Keep directories to a few hundred entries, like a real vault.
+    return root / f"{index // 250:04d}"
+
+
+def generate_tree(base: Path, size: int, *, seed: int) -> tuple[Path, Path]:
+    rng = random.Random(seed)
+    snippets_root = base / "snippets"
+    sets_root = base / "sets"
+
+    for i in range(size):
+        folder = _fan_out(snippets_root, i)
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / f"snippet-{i:06d}.md").write_text(
+            "---\n"
+            f"slug: snippet-{i:06d}\n"
+            "scope: global\n"
+            "schema_version: 1\n"
+            "---\n"
+            f"Instruction {i}.\n\n" + "Keep the tone plain and direct. " * 8 + "\n",
+            encoding="utf-8",
+        )
+
+    for i in range(size):
+        folder = _fan_out(sets_root, i)
+        folder.mkdir(parents=True, exist_ok=True)
+        members = rng.sample(range(size), min(SNIPPETS_PER_SET, size))
+        third = max(1, len(members) // 3)
+        sections = {
+            "global": members[:third],
+            "context": members[third:2 * third],
+            "batch": members[2 * third:],
+        }
+        lines = [f"slug: set-{i:06d}"]
+        for name, items in sections.items():
+            if items:
+                lines.append(f"{name}:")
+                lines.extend(f"  - snippet-{item:06d}" for item in items)
+        (folder / f"set-{i:06d}.yaml").write_text(
+            "\n".join(lines) + "\n",
+            encoding="utf-8",
+        )
+
+    return snippets_root, sets_root
+
+
+# ------------------------------------------------------------
+# Timing
+# ------------------------------------------------------------
+
+def timed(fn: Callable[[], object]) -> tuple[float, object]:
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn()
+    return time.perf_counter() - start, result
+
+
+def bench_size(size: int, *, seed: int, keep: bool) -> dict:
+    workdir = Path(tempfile.mkdtemp(prefix=f"bench-loaders-{size}-"))
+    os.environ["AUTOSCRIBE_DB_PATH"] = str(workdir / "bench.sqlite")
+
+    from adapters import sets, snippets
+
+    results: dict[str, dict[str, float]] = {}
+
+    elapsed, (snippets_root, sets_root) = timed(
+        lambda: generate_tree(workdir / "tree", size, seed=seed)
+    )
+    results["generate"] = {"total": elapsed}
+
+    candidates_path = workdir / "candidates.ndjson"
+    emitted_path = workdir / "emitted.ndjson"
+
+    # check_instructions
+    stages: dict[str, float] = {}
+    stages["map_slugs"], slug_map = timed(lambda: snippets.map_slugs(snippets_root))
+    stages["scan"], _ = timed(
+        lambda: snippets._scan_instruction_candidates(snippets_root)
+    )
+    stages["total"], _ = timed(
+        lambda: snippets.check_instructions(
+            root=snippets_root,
+            output=str(candidates_path),
+            report=False,
+        )
+    )
+    results["check_instructions"] = stages
+
+    # emit_instructions
+    paths = sorted(slug_map.items())
+    stages = {}
+    stages["read_hash"], texts = timed(
+        lambda: [snippets._read_snippet(path)[1] for _, path in paths]
+    )
+    stages["parse"], _ = timed(
+        lambda: [
+            snippets._snippet_fields(
+                *snippets._split_front_matter(text, path=path),
+                path=path,
+                slug=slug,
+            )
+            for (slug, path), text in zip(paths, texts)
+        ]
+    )
+    stages["total"], _ = timed(
+        lambda: snippets.emit_instructions(
+            input=str(candidates_path),
+            output=str(emitted_path),
+            report=False,
+        )
+    )
+    results["emit_instructions"] = stages
+
+    # load_sets
+    root = sets_root.resolve()
+    stages = {}
+    stages["find"], files = timed(lambda: sets._find_set_files(root))
+    stages["extract"], _ = timed(lambda: sets._collect_set_rows(root, files))
+    stages["cold"], _ = timed(
+        lambda: sets.load_sets(root=root, report=False, bulk=True)
+    )
+    stages["warm"], _ = timed(lambda: sets.load_sets(root=root, report=False))
+    stages["warm_bulk"], _ = timed(
+        lambda: sets.load_sets(root=root, report=False, bulk=True)
+    )
+    stages["incremental_prime"], _ = timed(
+        lambda: sets.load_sets(root=root, report=False, incremental=True)
+    )
+    stages["incremental_noop"], _ = timed(
+        lambda: sets.load_sets(root=root, report=False, incremental=True)
+    )
+    results["load_sets"] = stages
+
+    if not keep:
+        import shutil
+
+        shutil.rmtree(workdir, ignore_errors=True)
+    else:
+        results["workdir"] = str(workdir)
+
+    return {"size": size, "seconds": results}
+
+
+def main() -> int:
+    ns = parse_args()
+    sys.path.insert(0, str(REPO_ROOT))
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": [bench_size(size, seed=ns.seed, keep=ns.keep) for size in ns.sizes],
+    }
+
+    text = json.dumps(report, indent=2) + "\n"
+    if ns.output == "-":
+        sys.stdout.write(text)
+    else:
+        Path(ns.output).write_text(text, encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
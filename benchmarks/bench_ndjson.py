@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""Benchmark NDJSON encode/decode throughput of the shared codec.
+
+The baseline is the previous producer path, asc.io.ndjson, when it is
+importable, and plain buffered stdlib json otherwise.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import random
+import string
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_COUNTS = (10_000, 100_000)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Report records/s for the previous NDJSON path vs the batched codec."
+    )
+    parser.add_argument(
+        "--counts",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_COUNTS),
+        help="Record counts to time (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--content-bytes",
+        type=int,
+        default=1024,
+        help="Approximate content size per record (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--output",
+        default="-",
+        help="Write JSON results here; '-' for stdout (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=1,
+        help="Random seed for record content (default: %(default)s).",
+    )
+    ns = parser.parse_args()
+    if any(count < 1 for count in ns.counts):
+        parser.error("--counts must be positive")
+    return ns
+
+
+def make_records(count: int, *, content_bytes: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + "    \n"
+    return [
+        {
+            "type": "instruction_snippet",
+            "slug": f"snippet-{i:06d}",
+            "path": f"/tmp/instructions/{i % 97:02d}/snippet-{i:06d}.md",
+            "sha256": f"{rng.getrandbits(256):064x}",
+            "mtime": 1_700_000_000.0 + i,
+            "size": content_bytes,
+            "scope": ["global", "batch"][i % 2],
+            "content": "".join(rng.choices(alphabet, k=content_bytes)),
+        }
+        for i in range(count)
+    ]
+
+
+def timed(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def bench_count(count: int, *, content_bytes: int, seed: int) -> dict:
+    from adapters import ndjson_codec
+
+    records = make_records(count, content_bytes=content_bytes, seed=seed)
+    fd, tmp = tempfile.mkstemp(suffix=".ndjson")
+    os.close(fd)
+    path = Path(tmp)
+
+    try:
+        from asc.io.ndjson import emit_ndjson, iter_ndjson
+    except ImportError:
+        baseline = "stdlib"
+
+        def write_baseline() -> None:
+            with path.open("w", encoding="utf-8") as fh:
+                for record in records:
+                    fh.write(json.dumps(record) + "\n")
+
+        def read_baseline() -> None:
+            with path.open("r", encoding="utf-8") as fh:
+                for line in fh:
+                    if line.strip():
+                        json.loads(line)
+
+    else:
+        baseline = "asc.io.ndjson"
+
+        def write_baseline() -> None:
+            with path.open("w", encoding="utf-8") as fh:
+                for record in records:
+                    emit_ndjson(fh, [record])
+
+        def read_baseline() -> None:
+            with path.open("r", encoding="utf-8") as fh:
+                for _ in iter_ndjson(fh):
+                    pass
+
+    def write_codec() -> None:
+        with path.open("w", encoding="utf-8") as fh:
+            with ndjson_codec.NdjsonWriter(fh) as writer:
+                writer.write_many(records)
+
+    def read_codec() -> None:
+        with path.open("r", encoding="utf-8") as fh:
+            for _ in ndjson_codec.iter_ndjson(fh):
+                pass
+
+    try:
+        seconds = {
+            "write_baseline": timed(write_baseline),
+            "read_baseline": timed(read_baseline),
+            "write_codec": timed(write_codec),
+            "read_codec": timed(read_codec),
+        }
+    finally:
+        path.unlink(missing_ok=True)
+
+    return {
+        "count": count,
+        "baseline": baseline,
+        "codec": ndjson_codec.CODEC,
+        "records_per_second": {
+            name: round(count / elapsed) if elapsed else None
+            for name, elapsed in seconds.items()
+        },
+    }
+
+
+def main() -> int:
+    ns = parse_args()
+    sys.path.insert(0, str(REPO_ROOT))
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": [
+            bench_count(count, content_bytes=ns.content_bytes, seed=ns.seed)
+            for count in ns.counts
+        ],
+    }
+
+    text = json.dumps(report, indent=2) + "\n"
+    if ns.output == "-":
+        sys.stdout.write(text)
+    else:
+        Path(ns.output).write_text(text, encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())